@@ -0,0 +1,229 @@
+from core.case_store import AUTHOR_FIELDS, active_case_store, metadata_text
+
+
+SEVERITY_LEVELS = ["low", "medium", "high"]
+FILE_METADATA_FIELDS = ["file_extension", "created_time", "modified_time", "signature_valid"]
+FILE_HASH_FIELDS = ["md5", "sha256"]
+SIZE_BINS = [0, 1024, 1024 ** 2, 10 * 1024 ** 2, 100 * 1024 ** 2, 1024 ** 3, float("inf")]
+SIZE_LABELS = ["< 1 KB", "1 KB - 1 MB", "1 - 10 MB", "10 - 100 MB", "100 MB - 1 GB", ">= 1 GB"]
+HIGH_CONFIDENCE = 80
+
+
+def _columns(*names):
+    return {name: [] for name in names}
+
+
+def _frames_from_records(case_data):
+    import pandas
+    
+    files = _columns("file_id", "file_path", "file_name", "file_size", "hash_status", *FILE_METADATA_FIELDS, *FILE_HASH_FIELDS)
+    metadata = _columns("file_id", "field", "value")
+    anomalies = _columns("file_id", "type", "severity", "message")
+    
+    for file_id, file_data in enumerate(case_data.get("files", [])):
+        file_metadata = file_data.get("metadata", {})
+        hashes = file_data.get("hashes", {})
+        files["file_id"].append(file_id)
+        files["file_path"].append(file_data.get("file_path", file_metadata.get("file_path")))
+        files["file_name"].append(file_metadata.get("file_name"))
+        files["file_size"].append(file_metadata.get("file_size"))
+        files["hash_status"].append(file_data.get("hash_status", "full"))
+        for field in FILE_METADATA_FIELDS:
+            value = file_metadata.get(field)
+            files[field].append(None if value == "" else value)
+        for field in FILE_HASH_FIELDS:
+            files[field].append(hashes.get(field))
+        
+        # Same rows the case store indexes, so both sources give identical frames.
+        for field, value in file_metadata.items():
+            if value not in (None, "") and "error" not in field:
+                metadata["file_id"].append(file_id)
+                metadata["field"].append(field)
+                metadata["value"].append(metadata_text(value))
+        
+        for anomaly in file_data.get("anomalies", []):
+            anomalies["file_id"].append(file_id)
+            anomalies["type"].append(anomaly.get("type"))
+            anomalies["severity"].append(anomaly.get("severity"))
+            anomalies["message"].append(anomaly.get("message"))
+    
+    correlations = _columns("corr_id", "type", "matched_field", "matched_value", "confidence", "file_count")
+    correlation_files = _columns("corr_id", "file_id")
+    for corr_id, corr in enumerate(case_data.get("correlations", [])):
+        file_indices = corr.get("file_indices", [])
+        correlations["corr_id"].append(corr_id)
+        correlations["type"].append(corr.get("type"))
+        correlations["matched_field"].append(corr.get("matched_field"))
+        correlations["matched_value"].append(corr.get("matched_value"))
+        correlations["confidence"].append(corr.get("confidence"))
+        correlations["file_count"].append(corr.get("file_count", len(file_indices)))
+        correlation_files["corr_id"].extend([corr_id] * len(file_indices))
+        correlation_files["file_id"].extend(file_indices)
+    
+    return {name: pandas.DataFrame(columns) for name, columns in [
+        ("files", files), ("metadata", metadata), ("anomalies", anomalies),
+        ("correlations", correlations), ("correlation_files", correlation_files)
+    ]}
+
+
+def _frames_from_store(store):
+    with store.lock:
+        return _read_store_frames(store.conn)
+
+
+def _read_store_frames(conn):
+    import pandas
+    
+    files = pandas.read_sql_query("SELECT file_id, file_path, file_name, file_size, hash_status FROM files ORDER BY file_id", conn)
+    metadata = pandas.read_sql_query("SELECT file_id, field, value FROM metadata ORDER BY rowid", conn)
+    
+    # The store keeps metadata values as JSON text for anything that is not already a string.
+    wide = metadata[metadata["field"].isin(FILE_METADATA_FIELDS)].pivot(index="file_id", columns="field", values="value")
+    hashes = pandas.read_sql_query(
+        "SELECT file_id, algorithm, value FROM hashes WHERE algorithm IN ('md5', 'sha256')", conn
+    ).pivot(index="file_id", columns="algorithm", values="value")
+    files = files.join(wide.reindex(columns=FILE_METADATA_FIELDS), on="file_id").join(hashes.reindex(columns=FILE_HASH_FIELDS), on="file_id")
+    files["signature_valid"] = files["signature_valid"].map({"true": True, "false": False})
+    
+    return {
+        "files": files,
+        "metadata": metadata,
+        "anomalies": pandas.read_sql_query("SELECT file_id, type, severity, message FROM anomalies ORDER BY rowid", conn),
+        "correlations": pandas.read_sql_query(
+            "SELECT c.corr_id, c.type, json_extract(c.record, '$.matched_field') AS matched_field, "
+            "json_extract(c.record, '$.matched_value') AS matched_value, c.confidence, json_extract(c.record, '$.file_count') AS file_count "
+            "FROM correlations c ORDER BY c.corr_id",
+            conn
+        ),
+        "correlation_files": pandas.read_sql_query("SELECT corr_id, file_id FROM correlation_files ORDER BY rowid", conn)
+    }
+
+
+def _category(series, leading=()):
+    import pandas
+    
+    observed = sorted(set(series.dropna().unique()) - set(leading))
+    return series.astype(pandas.CategoricalDtype(list(leading) + observed, ordered=bool(leading)))
+
+
+def _typed_frames(frames):
+    import pandas
+    
+    files = frames["files"].set_index("file_id")
+    files["file_size"] = pandas.to_numeric(files["file_size"], errors="coerce").astype("Int64")
+    for column in ("created_time", "modified_time"):
+        files[column] = pandas.to_datetime(files[column], errors="coerce", format="ISO8601")
+    files["signature_valid"] = files["signature_valid"].astype("boolean")
+    for column in ("file_extension", "hash_status"):
+        files[column] = files[column].astype("category")
+    for column in ("file_path", "file_name", *FILE_HASH_FIELDS):
+        files[column] = files[column].astype("string")
+    
+    metadata = frames["metadata"]
+    metadata = metadata.assign(file_id=metadata["file_id"].astype("int64"), field=metadata["field"].astype("category"),
+                               value=metadata["value"].astype("string"))
+    
+    anomalies = frames["anomalies"]
+    anomalies = anomalies.assign(
+        file_id=anomalies["file_id"].astype("int64"),
+        type=anomalies["type"].astype("category"),
+        # Ordered, so severity >= "medium" style filters and sorts work directly.
+        severity=_category(anomalies["severity"].astype("string").str.lower(), SEVERITY_LEVELS),
+        message=anomalies["message"].astype("string")
+    )
+    
+    correlations = frames["correlations"].set_index("corr_id")
+    correlations = correlations.assign(
+        type=correlations["type"].astype("category"),
+        matched_field=correlations["matched_field"].astype("category"),
+        matched_value=correlations["matched_value"].map(lambda value: value if value is None else str(value)).astype("string"),
+        confidence=pandas.to_numeric(correlations["confidence"], errors="coerce").astype("Int64"),
+        file_count=correlations["file_count"].astype("int64")
+    )
+    
+    correlation_files = frames["correlation_files"].astype("int64")
+    return {"files": files, "metadata": metadata, "anomalies": anomalies,
+            "correlations": correlations, "correlation_files": correlation_files}
+
+
+def case_to_frames(case_data):
+    store = active_case_store(case_data)
+    frames = _frames_from_store(store) if store is not None else _frames_from_records(case_data)
+    return _typed_frames(frames)
+
+
+def case_frames(case_data):
+    frames = case_data.get("_case_frames")
+    if frames is None:
+        frames = case_data["_case_frames"] = case_to_frames(case_data)
+    return frames
+
+
+def frame_summary(frames):
+    files = frames["files"]
+    anomalies = frames["anomalies"]
+    correlations = frames["correlations"]
+    return {
+        "total_files": len(files),
+        "total_size": int(files["file_size"].sum()),
+        "total_anomalies": len(anomalies),
+        "critical_anomalies": int((anomalies["severity"] == "high").sum()),
+        "files_with_anomalies": int(anomalies["file_id"].nunique()),
+        "files_with_signature_issues": int((~files["signature_valid"].fillna(True)).sum()),
+        "deferred_hashes": int((files["hash_status"] == "deferred").sum()),
+        "correlation_count": len(correlations),
+        "high_confidence_correlations": int((correlations["confidence"] >= HIGH_CONFIDENCE).sum())
+    }
+
+
+def anomalies_by_severity_and_extension(frames):
+    anomalies = frames["anomalies"].join(frames["files"]["file_extension"], on="file_id")
+    return anomalies.groupby(["severity", "file_extension"], observed=True).size().unstack(fill_value=0)
+
+
+def anomalies_by_type(frames):
+    return frames["anomalies"].groupby(["type", "severity"], observed=True).size().unstack(fill_value=0)
+
+
+def extension_summary(frames):
+    files = frames["files"]
+    return files.groupby("file_extension", observed=True)["file_size"].agg(["count", "sum", "mean", "max"])
+
+
+def size_distribution(frames, bins=SIZE_BINS, labels=SIZE_LABELS):
+    import pandas
+    
+    sizes = frames["files"]["file_size"].astype("float64")
+    return pandas.cut(sizes, bins=bins, labels=labels, right=False).value_counts(sort=False)
+
+
+def author_counts(frames, fields=AUTHOR_FIELDS):
+    metadata = frames["metadata"]
+    return metadata.loc[metadata["field"].isin(fields), "value"].value_counts()
+
+
+def filter_files(frames, extension=None, min_severity=None, anomaly_type=None, author=None, min_size=None, max_size=None):
+    import pandas
+    
+    files = frames["files"]
+    anomalies = frames["anomalies"]
+    mask = pandas.Series(True, index=files.index)
+    
+    if extension is not None:
+        mask &= (files["file_extension"].str.lower() == extension.lower()).fillna(False)
+    if min_size is not None:
+        mask &= (files["file_size"] >= min_size).fillna(False)
+    if max_size is not None:
+        mask &= (files["file_size"] <= max_size).fillna(False)
+    if min_severity is not None or anomaly_type is not None:
+        selected = pandas.Series(True, index=anomalies.index)
+        if min_severity is not None:
+            selected &= anomalies["severity"] >= min_severity
+        if anomaly_type is not None:
+            selected &= anomalies["type"] == anomaly_type
+        mask &= files.index.isin(anomalies.loc[selected, "file_id"].unique())
+    if author is not None:
+        metadata = frames["metadata"]
+        mask &= files.index.isin(metadata.loc[metadata["field"].isin(AUTHOR_FIELDS) & (metadata["value"] == author), "file_id"].unique())
+    
+    return files[mask]
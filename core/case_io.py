@@ -0,0 +1,207 @@
+import gzip
+import json
+import lzma
+from pathlib import Path
+
+
+STREAMED_CASE_KEYS = ("files", "correlations")
+READ_CHUNK_SIZE = 1024 * 1024
+VALUE_TERMINATORS = ",]}: \t\r\n"
+
+_encoder = json.JSONEncoder(ensure_ascii=False, default=str)
+_decoder = json.JSONDecoder()
+
+
+def _case_suffixes(path):
+    suffixes = [suffix.lower() for suffix in Path(path).suffixes]
+    compression = suffixes[-1] if suffixes and suffixes[-1] in (".gz", ".xz", ".lzma") else None
+    if compression:
+        suffixes = suffixes[:-1]
+    return (suffixes[-1] if suffixes else ""), compression
+
+
+def open_case_file(path, mode):
+    _, compression = _case_suffixes(path)
+    if compression == ".gz":
+        return gzip.open(path, mode + "t", encoding="utf-8", compresslevel=6)
+    if compression in (".xz", ".lzma"):
+        return lzma.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def is_jsonl_path(path):
+    return _case_suffixes(path)[0] == ".jsonl"
+
+
+def clean_file_record(file_entry):
+    return {
+        "file_path": file_entry["file_path"],
+        "metadata": {key: value for key, value in file_entry["metadata"].items() if "error" not in key},
+        "hashes": file_entry["hashes"],
+        "hash_status": file_entry.get("hash_status", "full"),
+        "anomalies": file_entry["anomalies"],
+        "fingerprints": file_entry.get("fingerprints", {})
+    }
+
+
+def case_header(case_data):
+    # Underscore keys hold live, in-memory state such as the correlation engine.
+    return {key: value for key, value in case_data.items() if not key.startswith("_") and key not in STREAMED_CASE_KEYS}
+
+
+def write_case_json(case_data, f):
+    f.write("{")
+    for key, value in case_header(case_data).items():
+        f.write(f"{_encoder.encode(key)}: {_encoder.encode(value)},\n")
+    
+    f.write('"files": [')
+    for position, file_entry in enumerate(case_data.get("files", [])):
+        f.write(",\n" if position else "\n")
+        f.write(_encoder.encode(clean_file_record(file_entry)))
+    
+    f.write('\n],\n"correlations": [')
+    for position, correlation in enumerate(case_data.get("correlations", [])):
+        f.write(",\n" if position else "\n")
+        f.write(_encoder.encode(correlation))
+    f.write("\n]}\n")
+
+
+def write_case_jsonl(case_data, f):
+    f.write(_encoder.encode({"record": "case", **case_header(case_data)}) + "\n")
+    for file_entry in case_data.get("files", []):
+        f.write(_encoder.encode({"record": "file", **clean_file_record(file_entry)}) + "\n")
+    for correlation in case_data.get("correlations", []):
+        f.write(_encoder.encode({"record": "correlation", **correlation}) + "\n")
+
+
+def write_case_file(case_data, output_path):
+    with open_case_file(output_path, "w") as f:
+        if is_jsonl_path(output_path):
+            write_case_jsonl(case_data, f)
+        else:
+            write_case_json(case_data, f)
+
+
+class _JsonStream:
+    def __init__(self, f):
+        self.f = f
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+    
+    def _fill(self):
+        if self.eof:
+            return False
+        chunk = self.f.read(READ_CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+    
+    def peek(self):
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+    
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos} of the case file")
+        self.pos += 1
+    
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+                # A number cut by the chunk boundary still decodes ("-12.5" of "-12.5e-3"),
+                # so only accept a value once the character after it is visible.
+                if self.eof or (end < len(self.buffer) and self.buffer[end] in VALUE_TERMINATORS):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill()
+    
+    def iter_array(self):
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            separator = self.peek()
+            self.pos += 1
+            if separator == "]":
+                return
+            if separator != ",":
+                raise ValueError(f"Expected ',' or ']' at offset {self.pos - 1} of the case file")
+
+
+def _iter_case_json(f):
+    stream = _JsonStream(f)
+    header = {}
+    stream.expect("{")
+    if stream.peek() == "}":
+        yield "case", header
+        return
+    
+    while True:
+        key = stream.value()
+        stream.expect(":")
+        if key in STREAMED_CASE_KEYS and stream.peek() == "[":
+            if header is not None:
+                yield "case", header
+                header = None
+            record_kind = "file" if key == "files" else "correlation"
+            for record in stream.iter_array():
+                yield record_kind, record
+        elif header is not None:
+            header[key] = stream.value()
+        else:
+            yield "case_field", (key, stream.value())
+        
+        separator = stream.peek()
+        stream.pos += 1
+        if separator == "}":
+            break
+        if separator != ",":
+            raise ValueError(f"Expected ',' or '}}' at offset {stream.pos - 1} of the case file")
+    
+    if header is not None:
+        yield "case", header
+
+
+def _iter_case_jsonl(f):
+    for line in f:
+        if line.strip():
+            record = json.loads(line)
+            yield record.pop("record", "file"), record
+
+
+def iter_case_records(path):
+    with open_case_file(path, "r") as f:
+        if is_jsonl_path(path):
+            yield from _iter_case_jsonl(f)
+        else:
+            yield from _iter_case_json(f)
+
+
+def read_case_file(path):
+    case_data = {"files": [], "correlations": []}
+    for kind, record in iter_case_records(path):
+        if kind == "case":
+            case_data.update(record)
+        elif kind == "case_field":
+            case_data[record[0]] = record[1]
+        elif kind == "file":
+            case_data["files"].append(record)
+        elif kind == "correlation":
+            case_data["correlations"].append(record)
+    return case_data
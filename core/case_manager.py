@@ -1,74 +1,120 @@
-import json
 from datetime import datetime
 from pathlib import Path
-from core.correlation import add_correlations_to_case
+from core.correlation import add_correlations_to_case, case_correlation_engine, default_correlation_rules
 
 
-def create_case(case_name, files_data):
+def create_case(case_name, files_data, correlation_rules=None, correlation_options=None):
     case = {
         "case_id": datetime.now().strftime("%Y%m%d_%H%M%S"),
         "case_name": case_name,
         "created_at": datetime.now().isoformat(),
         "total_files": len(files_data),
-        "files": files_data
+        "files": files_data,
+        "correlation_rules": list(correlation_rules) if correlation_rules is not None else default_correlation_rules()
     }
+    if correlation_options:
+        case["correlation_options"] = correlation_options
     
+    case["summary_counters"] = summary_counters(files_data)
     case = add_correlations_to_case(case)
     return case
 
 
-def export_case_json(case_data, output_path):
-    clean_case = {
-        "case_id": case_data["case_id"],
-        "case_name": case_data["case_name"],
-        "created_at": case_data["created_at"],
-        "total_files": case_data["total_files"],
-        "files": [],
-        "correlations": case_data.get("correlations", []),
-        "correlation_count": case_data.get("correlation_count", 0)
+def file_summary_counters(file_entry):
+    anomalies = file_entry.get("anomalies", [])
+    return {
+        "total_anomalies": len(anomalies),
+        "critical_anomalies": sum(1 for anomaly in anomalies if anomaly.get("severity") == "high"),
+        "files_with_signature_issues": 0 if file_entry.get("metadata", {}).get("signature_valid", True) else 1
     }
+
+
+def summary_counters(files_data):
+    counters = {"total_anomalies": 0, "critical_anomalies": 0, "files_with_signature_issues": 0}
+    update_summary_counters(counters, files_data, 1)
+    return counters
+
+
+def update_summary_counters(counters, files_data, sign):
+    for file_entry in files_data:
+        for key, value in file_summary_counters(file_entry).items():
+            counters[key] += sign * value
+
+
+def case_summary_counters(case_data):
+    if "summary_counters" not in case_data:
+        case_data["summary_counters"] = summary_counters(case_data["files"])
+    return case_data["summary_counters"]
+
+
+def materialize_case_records(case_data):
+    # Cases opened from a store hold read-only lazy views; edits need real lists.
+    for key in ("files", "correlations"):
+        if not isinstance(case_data.get(key, []), list):
+            case_data[key] = list(case_data[key])
+
+
+def add_files_to_case(case_data, files_data):
+    files_data = list(files_data)
+    materialize_case_records(case_data)
+    engine = case_correlation_engine(case_data)
+    counters = case_summary_counters(case_data)
     
-    for file_entry in case_data["files"]:
-        clean_metadata = {}
-        for key, value in file_entry["metadata"].items():
-            if "error" not in key:
-                clean_metadata[key] = value
-        
-        clean_file = {
-            "file_path": file_entry["file_path"],
-            "metadata": clean_metadata,
-            "hashes": file_entry["hashes"],
-            "anomalies": file_entry["anomalies"]
-        }
-        clean_case["files"].append(clean_file)
+    case_data["files"].extend(files_data)
+    case_data["total_files"] = len(case_data["files"])
+    update_summary_counters(counters, files_data, 1)
+    engine.add_files(files_data)
+    
+    return add_correlations_to_case(case_data, rebuild=False)
+
+
+def remove_files_from_case(case_data, file_indices):
+    file_indices = sorted(set(file_indices))
+    materialize_case_records(case_data)
+    engine = case_correlation_engine(case_data)
+    counters = case_summary_counters(case_data)
+    
+    removed = [case_data["files"][idx] for idx in file_indices]
+    engine.remove_files(file_indices)
+    for idx in reversed(file_indices):
+        del case_data["files"][idx]
+    case_data["total_files"] = len(case_data["files"])
+    update_summary_counters(counters, removed, -1)
+    
+    return add_correlations_to_case(case_data, rebuild=False)
+
+
+def export_case_json(case_data, output_path):
+    from core.case_io import write_case_file
     
     try:
-        with open(output_path, 'w') as f:
-            json.dump(clean_case, f, indent=2)
+        write_case_file(case_data, output_path)
         return {"success": True, "message": f"Case exported to {output_path}"}
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 
+def load_case_json(input_path):
+    from core.case_io import read_case_file
+    
+    try:
+        return {"success": True, "case": read_case_file(input_path)}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
 def generate_summary(case_data):
+    from core.case_frames import case_frames, frame_summary
+    
     summary = {
         "case_id": case_data["case_id"],
         "case_name": case_data["case_name"],
         "created_at": case_data["created_at"],
-        "total_files": case_data["total_files"],
-        "total_anomalies": 0,
-        "critical_anomalies": 0,
-        "files_with_signature_issues": 0
+        "total_files": case_data["total_files"]
     }
     
-    for file_entry in case_data["files"]:
-        summary["total_anomalies"] += len(file_entry.get("anomalies", []))
-        
-        for anomaly in file_entry.get("anomalies", []):
-            if anomaly.get("severity") == "high":
-                summary["critical_anomalies"] += 1
-        
-        if not file_entry.get("metadata", {}).get("signature_valid", True):
-            summary["files_with_signature_issues"] += 1
+    counters = frame_summary(case_frames(case_data))
+    for key in ("total_anomalies", "critical_anomalies", "files_with_signature_issues"):
+        summary[key] = counters[key]
     
     return summary
@@ -0,0 +1,268 @@
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+from core.case_io import case_header, clean_file_record
+
+
+CASE_STORE_SUFFIX = ".mtcase"
+# Bump whenever the tables change; stores from another version are refused rather than half-read.
+STORE_VERSION = 1
+STORE_PAGE_SIZE = 200
+STORE_CACHED_PAGES = 16
+STORE_BATCH_SIZE = 5000
+AUTHOR_FIELDS = ["pdf_author", "word_author", "word_last_modified_by", "exif_Artist", "author"]
+
+SCHEMA = """
+    CREATE TABLE case_info (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+    CREATE TABLE files (
+        file_id INTEGER PRIMARY KEY,
+        file_path TEXT NOT NULL,
+        file_name TEXT,
+        file_size INTEGER,
+        hash_status TEXT,
+        record TEXT NOT NULL
+    );
+    CREATE TABLE hashes (file_id INTEGER NOT NULL, algorithm TEXT NOT NULL, value TEXT NOT NULL);
+    CREATE TABLE metadata (file_id INTEGER NOT NULL, field TEXT NOT NULL, value TEXT NOT NULL);
+    CREATE TABLE metadata_fields (position INTEGER PRIMARY KEY, field TEXT NOT NULL);
+    CREATE TABLE anomalies (file_id INTEGER NOT NULL, type TEXT, severity TEXT, message TEXT);
+    CREATE TABLE correlations (corr_id INTEGER PRIMARY KEY, type TEXT NOT NULL, confidence INTEGER, record TEXT NOT NULL);
+    CREATE TABLE correlation_files (corr_id INTEGER NOT NULL, file_id INTEGER NOT NULL);
+"""
+
+INDEXES = """
+    CREATE INDEX idx_files_path ON files (file_path);
+    CREATE INDEX idx_hashes_value ON hashes (value, algorithm);
+    CREATE INDEX idx_metadata_field_value ON metadata (field, value);
+    CREATE INDEX idx_metadata_value ON metadata (value);
+    CREATE INDEX idx_anomalies_type ON anomalies (type, severity);
+    CREATE INDEX idx_correlations_type ON correlations (type, confidence);
+    CREATE INDEX idx_correlation_files_file ON correlation_files (file_id);
+    CREATE INDEX idx_correlation_files_corr ON correlation_files (corr_id);
+"""
+
+
+def metadata_text(value):
+    return value if isinstance(value, str) else json.dumps(value, default=str)
+
+
+def _batched(rows, size=STORE_BATCH_SIZE):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _write_files(conn, files):
+    fields = {}
+    for batch in _batched(enumerate(files)):
+        file_rows, hash_rows, metadata_rows, anomaly_rows = [], [], [], []
+        for file_id, file_entry in batch:
+            record = clean_file_record(file_entry)
+            metadata = record["metadata"]
+            fields.update(dict.fromkeys(metadata))
+            file_rows.append((file_id, record["file_path"], metadata.get("file_name"), metadata.get("file_size"),
+                              record["hash_status"], json.dumps(record, default=str)))
+            hash_rows.extend((file_id, algorithm, value) for algorithm, value in record["hashes"].items())
+            metadata_rows.extend((file_id, field, metadata_text(value)) for field, value in metadata.items() if value not in (None, ""))
+            anomaly_rows.extend((file_id, anomaly.get("type"), anomaly.get("severity"), anomaly.get("message"))
+                                for anomaly in record["anomalies"])
+        conn.executemany("INSERT INTO files VALUES (?, ?, ?, ?, ?, ?)", file_rows)
+        conn.executemany("INSERT INTO hashes VALUES (?, ?, ?)", hash_rows)
+        conn.executemany("INSERT INTO metadata VALUES (?, ?, ?)", metadata_rows)
+        conn.executemany("INSERT INTO anomalies VALUES (?, ?, ?, ?)", anomaly_rows)
+    conn.executemany("INSERT INTO metadata_fields VALUES (?, ?)", enumerate(fields))
+
+
+def _write_correlations(conn, correlations):
+    for batch in _batched(enumerate(correlations)):
+        conn.executemany(
+            "INSERT INTO correlations VALUES (?, ?, ?, ?)",
+            [(corr_id, corr["type"], corr.get("confidence"), json.dumps(corr, default=str)) for corr_id, corr in batch]
+        )
+        conn.executemany(
+            "INSERT INTO correlation_files VALUES (?, ?)",
+            [(corr_id, file_id) for corr_id, corr in batch for file_id in corr.get("file_indices", [])]
+        )
+
+
+def save_case_store(case_data, db_path):
+    db_path = Path(db_path)
+    temp_path = db_path.with_name(db_path.name + ".tmp")
+    if temp_path.exists():
+        temp_path.unlink()
+    
+    try:
+        store = case_data.get("_case_store")
+        conn = sqlite3.connect(str(temp_path))
+        try:
+            conn.execute("PRAGMA journal_mode=OFF")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.executescript(SCHEMA)
+            header = {**case_header(case_data), "store_version": STORE_VERSION}
+            conn.executemany("INSERT INTO case_info VALUES (?, ?)",
+                             [(key, json.dumps(value, default=str)) for key, value in header.items()])
+            _write_files(conn, case_data.get("files", []))
+            _write_correlations(conn, case_data.get("correlations", []))
+            # Building indexes after the bulk insert is much cheaper than maintaining them row by row.
+            conn.executescript(INDEXES)
+            conn.commit()
+        finally:
+            conn.close()
+        # Saving over the open store: Windows cannot replace a file that is still open.
+        if store is not None and db_path.exists() and os.path.samefile(store.db_path, db_path):
+            with store.lock:
+                store.close()
+                os.replace(temp_path, db_path)
+                store.reopen()
+        else:
+            os.replace(temp_path, db_path)
+        return {"success": True, "message": f"Case saved to {db_path}"}
+    except Exception as e:
+        if temp_path.exists():
+            temp_path.unlink()
+        return {"success": False, "error": str(e)}
+
+
+class LazyRecordList:
+    def __init__(self, store, table, id_column, count):
+        self.store = store
+        self.query = f"SELECT {id_column}, record FROM {table} WHERE {id_column} >= ? AND {id_column} < ? ORDER BY {id_column}"
+        self.count = count
+        self.pages = {}
+    
+    def __len__(self):
+        return self.count
+    
+    def _page(self, page_number):
+        page = self.pages.get(page_number)
+        if page is None:
+            if len(self.pages) >= STORE_CACHED_PAGES:
+                self.pages.pop(next(iter(self.pages)))
+            start = page_number * STORE_PAGE_SIZE
+            rows = self.store.fetchall(self.query, (start, start + STORE_PAGE_SIZE))
+            page = self.pages[page_number] = [json.loads(record) for _, record in rows]
+        return page
+    
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(self.count))]
+        if idx < 0:
+            idx += self.count
+        if not 0 <= idx < self.count:
+            raise IndexError("case record index out of range")
+        return self._page(idx // STORE_PAGE_SIZE)[idx % STORE_PAGE_SIZE]
+    
+    def __iter__(self):
+        # Full scans read page by page rather than churning the page cache, and never hold the lock
+        # while the caller works on a record.
+        for start in range(0, self.count, STORE_PAGE_SIZE):
+            for _, record in self.store.fetchall(self.query, (start, start + STORE_PAGE_SIZE)):
+                yield json.loads(record)
+    
+    def __bool__(self):
+        return self.count > 0
+
+
+class CaseStore:
+    def __init__(self, db_path):
+        self.db_path = str(db_path)
+        # Background analysis and export threads read the store too; the lock serializes them.
+        self.lock = threading.RLock()
+        self.conn = None
+        self.files = self.correlations = None
+        self.reopen()
+        self.header = {key: json.loads(value) for key, value in self.fetchall("SELECT key, value FROM case_info")}
+        store_version = self.header.pop("store_version", None)
+        if store_version != STORE_VERSION:
+            self.close()
+            raise ValueError(f"Unsupported case store version {store_version} (expected {STORE_VERSION})")
+        # Ids are dense positions, so MAX on the rowid gives the count without a table scan.
+        file_count = self.fetchall("SELECT COALESCE(MAX(file_id) + 1, 0) FROM files")[0][0]
+        correlation_count = self.fetchall("SELECT COALESCE(MAX(corr_id) + 1, 0) FROM correlations")[0][0]
+        self.files = LazyRecordList(self, "files", "file_id", file_count)
+        self.correlations = LazyRecordList(self, "correlations", "corr_id", correlation_count)
+    
+    def reopen(self):
+        with self.lock:
+            self.conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False)
+            for records in (self.files, self.correlations):
+                if records is not None:
+                    records.pages.clear()
+    
+    def close(self):
+        with self.lock:
+            self.conn.close()
+    
+    def fetchall(self, query, params=()):
+        with self.lock:
+            return self.conn.execute(query, params).fetchall()
+    
+    def to_case(self):
+        case_data = dict(self.header)
+        case_data["files"] = self.files
+        case_data["correlations"] = self.correlations
+        case_data["_case_store"] = self
+        return case_data
+    
+    def metadata_fields(self):
+        return [row[0] for row in self.fetchall("SELECT field FROM metadata_fields ORDER BY position")]
+    
+    def _file_ids(self, query, params):
+        return [row[0] for row in self.fetchall(query, params)]
+    
+    def find_files_by_metadata(self, field, value):
+        return self._file_ids("SELECT DISTINCT file_id FROM metadata WHERE field = ? AND value = ? ORDER BY file_id", (field, metadata_text(value)))
+    
+    def find_files_by_value(self, value, fields=None):
+        if not fields:
+            return self._file_ids("SELECT DISTINCT file_id FROM metadata WHERE value = ? ORDER BY file_id", (metadata_text(value),))
+        placeholders = ", ".join("?" for _ in fields)
+        return self._file_ids(
+            f"SELECT DISTINCT file_id FROM metadata WHERE value = ? AND field IN ({placeholders}) ORDER BY file_id",
+            (metadata_text(value), *fields)
+        )
+    
+    def find_files_by_author(self, author):
+        return self.find_files_by_value(author, AUTHOR_FIELDS)
+    
+    def find_files_by_hash(self, value, algorithm=None):
+        if algorithm is None:
+            return self._file_ids("SELECT DISTINCT file_id FROM hashes WHERE value = ? ORDER BY file_id", (value.lower(),))
+        return self._file_ids("SELECT DISTINCT file_id FROM hashes WHERE value = ? AND algorithm = ? ORDER BY file_id",
+                              (value.lower(), algorithm))
+    
+    def find_files_with_anomaly(self, anomaly_type, severity=None):
+        if severity is None:
+            return self._file_ids("SELECT DISTINCT file_id FROM anomalies WHERE type = ? ORDER BY file_id", (anomaly_type,))
+        return self._file_ids("SELECT DISTINCT file_id FROM anomalies WHERE type = ? AND severity = ? ORDER BY file_id",
+                              (anomaly_type, severity))
+    
+    def correlations_for_file(self, file_id):
+        return [row[0] for row in self.fetchall(
+            "SELECT corr_id FROM correlation_files WHERE file_id = ? ORDER BY corr_id", (file_id,)
+        )]
+
+
+def active_case_store(case_data):
+    # The store only describes the case while its records are still the ones being read; once the
+    # GUI turns them into lists and edits them, the store is stale.
+    store = case_data.get("_case_store")
+    if store is not None and case_data.get("files") is store.files:
+        return store
+    return None
+
+
+def open_case_store(db_path):
+    try:
+        store = CaseStore(db_path)
+        return {"success": True, "case": store.to_case(), "store": store}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
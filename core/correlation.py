@@ -1,3 +1,21 @@
+import time
+from array import array
+
+from core.correlation_index import (PostingIndex, MultiIndexHash, MinHashLSH, UnionFind, DEFAULT_STOP_VALUE_RATIO,
+                                    DEFAULT_STOP_VALUE_MIN_FILES, DEFAULT_STOP_VALUE_SAMPLE)
+from core.similarity import parse_minhash, estimate_similarity
+from core.timestamps import TIMESTAMP_FIELDS, parse_timestamp, format_timestamp, sweep_clusters
+
+
+CORRELATION_RULES = {}
+DEFAULT_CLUSTER_WINDOW_SECONDS = 2
+DEFAULT_CLUSTER_MIN_FILES = 3
+DEFAULT_CLUSTER_MAX_SPAN_SECONDS = 300
+DEFAULT_IMAGE_HASH = "dhash"
+DEFAULT_IMAGE_HASH_DISTANCE = 7
+DEFAULT_DOCUMENT_SIMILARITY = 0.5
+
+
 def get_all_metadata_fields(metadata):
     fields = {}
     
@@ -8,97 +26,153 @@ def get_all_metadata_fields(metadata):
     return fields
 
 
-def find_matching_metadata(files_data):
-    correlations = []
+def register_correlation_rule(name, enabled=True):
+    def register(rule_class):
+        rule_class.name = name
+        rule_class.enabled_by_default = enabled
+        CORRELATION_RULES[name] = rule_class
+        return rule_class
+    return register
+
+
+class CorrelationRule:
+    name = None
+    enabled_by_default = True
+    # Posting-list rules can drop a file in place; the others are rebuilt when files are removed.
+    supports_remove = True
     
-    if len(files_data) < 2:
-        return correlations
+    def __init__(self, files_data):
+        self.files_data = files_data
+        self.index = PostingIndex(len(files_data))
+        self.correlations = {}
     
-    all_metadata = {}
-    for idx, file_entry in enumerate(files_data):
-        metadata = file_entry.get("metadata", {})
-        fields = get_all_metadata_fields(metadata)
-        
-        for field_name, field_value in fields.items():
+    def extract(self, metadata):
+        return []
+    
+    def document_values(self, idx, metadata):
+        return self.extract(metadata)
+    
+    def add(self, idx, metadata):
+        for field_name, value in self.document_values(idx, metadata):
+            self.index.add(idx, field_name, value)
+    
+    def remove(self, idx, metadata):
+        for field_name, value in self.document_values(idx, metadata):
+            self.index.remove(idx, field_name, value)
+    
+    def build_group(self, field_name, value, postings):
+        return None
+    
+    def dirty_keys(self):
+        return self.index.take_dirty()
+    
+    def build(self):
+        # Only groups whose postings changed since the last build are re-evaluated.
+        self.index.document_count = len(self.files_data)
+        for key in self.dirty_keys():
+            postings = self.index.postings.get(key)
+            correlation = None
+            if postings is not None and len(postings) >= 2:
+                correlation = self.build_group(self.index.field_name(key), self.index.values[key], postings)
+            if correlation is None:
+                self.correlations.pop(key, None)
+            else:
+                self.correlations[key] = correlation
+        return list(self.correlations.values())
+    
+    def file_names(self, file_indices):
+        return [self.files_data[i].get("metadata", {}).get("file_name", "Unknown") for i in file_indices]
+
+
+@register_correlation_rule("metadata_match")
+class MetadataMatchRule(CorrelationRule):
+    def __init__(self, files_data, stop_value_ratio=DEFAULT_STOP_VALUE_RATIO,
+                 stop_value_min_files=DEFAULT_STOP_VALUE_MIN_FILES, stop_value_sample=DEFAULT_STOP_VALUE_SAMPLE):
+        super().__init__(files_data)
+        self.stop_value_ratio = stop_value_ratio
+        self.stop_value_min_files = stop_value_min_files
+        self.stop_value_sample = stop_value_sample
+        self.stop_value_limit = None
+        self.built_limit = None
+        self.built_count = None
+    
+    def extract(self, metadata):
+        for field_name, field_value in get_all_metadata_fields(metadata).items():
             if field_value and field_value not in ["N/A", ""]:
-                field_key = f"{field_name}:{field_value}"
-                
-                if field_key not in all_metadata:
-                    all_metadata[field_key] = []
-                all_metadata[field_key].append({
-                    "file_idx": idx,
-                    "file_name": metadata.get("file_name", "Unknown"),
-                    "field_name": field_name,
-                    "field_value": field_value
-                })
-    
-    for field_key, matches in all_metadata.items():
-        if len(matches) > 1:
-            field_name = matches[0]["field_name"]
-            field_value = matches[0]["field_value"]
-            file_indices = [m["file_idx"] for m in matches]
-            file_names = [m["file_name"] for m in matches]
-            
-            confidence = min(95, 50 + (len(matches) * 15))
-            
-            correlation = {
+                yield field_name, field_value
+    
+    def dirty_keys(self):
+        dirty = super().dirty_keys()
+        stop_value_limit = self.index.stop_value_limit(self.stop_value_ratio, self.stop_value_min_files)
+        
+        # A new case size moves the stop-value limit and the shares quoted for stop values.
+        if self.built_count is not None and self.built_count != self.index.document_count and stop_value_limit is not None:
+            lowest_limit = min(stop_value_limit, self.built_limit)
+            dirty.update(dict.fromkeys(key for key, postings in self.index.postings.items() if len(postings) > lowest_limit))
+        self.stop_value_limit = stop_value_limit
+        self.built_limit = stop_value_limit
+        self.built_count = self.index.document_count
+        return dirty
+    
+    def build_group(self, field_name, field_value, postings):
+        file_count = len(postings)
+        
+        if self.stop_value_limit is not None and file_count > self.stop_value_limit:
+            file_indices = postings[:self.stop_value_sample].tolist()
+            share = round(100 * file_count / len(self.files_data))
+            return {
                 "type": "metadata_match",
                 "matched_field": field_name,
                 "matched_value": str(field_value)[:80],
-                "file_count": len(matches),
+                "file_count": file_count,
                 "file_indices": file_indices,
-                "files": file_names,
-                "confidence": confidence,
-                "explanation": f"{len(matches)} files share {field_name}: '{field_value}'. These files are likely related."
+                "files": self.file_names(file_indices),
+                "stop_value": True,
+                "confidence": 20,
+                "explanation": f"{file_count} files ({share}%) share {field_name}: '{field_value}'. The value is too common to link files; {len(file_indices)} are listed."
             }
-            correlations.append(correlation)
-    
-    return correlations
+        
+        file_indices = postings.tolist()
+        confidence = min(95, 50 + (file_count * 15))
+        
+        return {
+            "type": "metadata_match",
+            "matched_field": field_name,
+            "matched_value": str(field_value)[:80],
+            "file_count": file_count,
+            "file_indices": file_indices,
+            "files": self.file_names(file_indices),
+            "confidence": confidence,
+            "explanation": f"{file_count} files share {field_name}: '{field_value}'. These files are likely related."
+        }
 
 
-def find_device_correlation(files_data):
-    correlations = []
-    devices = {}
-    
-    for idx, file_entry in enumerate(files_data):
-        metadata = file_entry.get("metadata", {})
-        device_key = None
-        device_info = None
-        
+@register_correlation_rule("device_match")
+class DeviceMatchRule(CorrelationRule):
+    def extract(self, metadata):
         if "exif_Make" in metadata and "exif_Model" in metadata:
-            device_key = f"{metadata['exif_Make']}_{metadata['exif_Model']}"
-            device_info = f"{metadata['exif_Make']} {metadata['exif_Model']}"
-        
-        if device_key:
-            if device_key not in devices:
-                devices[device_key] = {"info": device_info, "indices": []}
-            devices[device_key]["indices"].append(idx)
-    
-    for device_key, device_data in devices.items():
-        file_indices = device_data["indices"]
-        if len(file_indices) > 1:
-            confidence = min(98, 60 + (len(file_indices) * 12))
-            
-            correlation = {
-                "type": "device_match",
-                "matched_value": device_data["info"],
-                "file_count": len(file_indices),
-                "file_indices": file_indices,
-                "confidence": confidence,
-                "explanation": f"{len(file_indices)} photos taken with {device_data['info']}. Same camera/device used."
-            }
-            correlations.append(correlation)
+            yield "device", (metadata["exif_Make"], metadata["exif_Model"])
     
-    return correlations
+    def build_group(self, field_name, device, postings):
+        file_indices = postings.tolist()
+        device_info = f"{device[0]} {device[1]}"
+        confidence = min(98, 60 + (len(file_indices) * 12))
+        
+        return {
+            "type": "device_match",
+            "matched_value": device_info,
+            "file_count": len(file_indices),
+            "file_indices": file_indices,
+            "confidence": confidence,
+            "explanation": f"{len(file_indices)} photos taken with {device_info}. Same camera/device used."
+        }
 
 
-def find_software_correlation(files_data):
-    correlations = []
-    software = {}
-    
-    for idx, file_entry in enumerate(files_data):
-        metadata = file_entry.get("metadata", {})
-        
+# Opt-in: metadata_match already groups files by pdf_producer and pdf_creator, so by default
+# this rule only repeated those groups under another name.
+@register_correlation_rule("software_match", enabled=False)
+class SoftwareMatchRule(CorrelationRule):
+    def extract(self, metadata):
         creator_software = None
         
         if "pdf_producer" in metadata:
@@ -107,67 +181,372 @@ def find_software_correlation(files_data):
             creator_software = metadata.get("pdf_creator")
         
         if creator_software and creator_software != "N/A":
-            if creator_software not in software:
-                software[creator_software] = []
-            software[creator_software].append(idx)
+            yield "software", creator_software
+    
+    def build_group(self, field_name, soft, postings):
+        file_indices = postings.tolist()
+        confidence = min(85, 45 + (len(file_indices) * 10))
+        
+        return {
+            "type": "software_match",
+            "matched_value": soft,
+            "file_count": len(file_indices),
+            "file_indices": file_indices,
+            "confidence": confidence,
+            "explanation": f"{len(file_indices)} files created with {soft}. Same software used to create files."
+        }
+
+
+@register_correlation_rule("timestamp_pattern")
+class TimestampPatternRule(CorrelationRule):
+    def extract(self, metadata):
+        created_time = metadata.get("created_time")
+        if created_time:
+            yield "created_time", created_time
+    
+    def build_group(self, field_name, timestamp, postings):
+        file_indices = postings.tolist()
+        
+        return {
+            "type": "timestamp_pattern",
+            "matched_value": timestamp,
+            "file_count": len(file_indices),
+            "file_indices": file_indices,
+            "confidence": 75,
+            "explanation": f"{len(file_indices)} files created at exact same time ({timestamp}). Suspicious timestamp pattern detected."
+        }
+
+
+# Opt-in: timestamp_pattern already reports exact created_time matches, and bursts are only
+# meaningful once bulk copies are filtered out, which needs a case-specific window.
+@register_correlation_rule("timestamp_cluster", enabled=False)
+class TimestampClusterRule(CorrelationRule):
+    supports_remove = False
+    
+    def __init__(self, files_data, window_seconds=DEFAULT_CLUSTER_WINDOW_SECONDS,
+                 min_files=DEFAULT_CLUSTER_MIN_FILES, fields=TIMESTAMP_FIELDS,
+                 max_span_seconds=DEFAULT_CLUSTER_MAX_SPAN_SECONDS, stop_value_ratio=DEFAULT_STOP_VALUE_RATIO,
+                 stop_value_min_files=DEFAULT_STOP_VALUE_MIN_FILES, stop_value_sample=DEFAULT_STOP_VALUE_SAMPLE):
+        super().__init__(files_data)
+        self.window_seconds = window_seconds
+        self.min_files = min_files
+        self.max_span_seconds = max_span_seconds
+        self.stop_value_ratio = stop_value_ratio
+        self.stop_value_min_files = stop_value_min_files
+        self.stop_value_sample = stop_value_sample
+        self.times = {field_name: array("d") for field_name in fields}
+        self.file_indices = {field_name: array("I") for field_name in fields}
+    
+    def add(self, idx, metadata):
+        for field_name, times in self.times.items():
+            seconds = parse_timestamp(field_name, metadata.get(field_name))
+            if seconds is not None:
+                times.append(seconds)
+                self.file_indices[field_name].append(idx)
+    
+    def build(self):
+        correlations = []
+        stop_value_limit = None
+        if self.stop_value_ratio is not None:
+            stop_value_limit = max(self.stop_value_min_files, int(len(self.files_data) * self.stop_value_ratio))
+        
+        for field_name, times in self.times.items():
+            file_positions = self.file_indices[field_name]
+            for cluster in sweep_clusters(times, self.window_seconds, self.min_files, self.max_span_seconds):
+                file_indices = [file_positions[position] for position in cluster]
+                first_time = times[cluster[0]]
+                last_time = times[cluster[-1]]
+                span = last_time - first_time
+                time_range = format_timestamp(first_time) if span == 0 else f"{format_timestamp(first_time)} to {format_timestamp(last_time)}"
+                
+                if stop_value_limit is not None and len(file_indices) > stop_value_limit:
+                    # Same treatment as metadata stop values: too many files to call it a burst.
+                    share = round(100 * len(file_indices) / len(self.files_data))
+                    correlations.append({
+                        "type": "timestamp_cluster",
+                        "matched_field": field_name,
+                        "matched_value": time_range,
+                        "file_count": len(file_indices),
+                        "file_indices": file_indices[:self.stop_value_sample],
+                        "span_seconds": span,
+                        "stop_value": True,
+                        "confidence": 20,
+                        "explanation": f"{len(file_indices)} files ({share}%) have {field_name} in {time_range}. Likely a bulk copy or extraction rather than related activity; {min(len(file_indices), self.stop_value_sample)} are listed."
+                    })
+                    continue
+                
+                confidence = min(90, 40 + (len(file_indices) * 5))
+                
+                correlation = {
+                    "type": "timestamp_cluster",
+                    "matched_field": field_name,
+                    "matched_value": time_range,
+                    "file_count": len(file_indices),
+                    "file_indices": file_indices,
+                    "span_seconds": span,
+                    "confidence": confidence,
+                    "explanation": f"{len(file_indices)} files have {field_name} within {span:g} seconds ({time_range}), each no more than {self.window_seconds}s from the previous. Burst of activity detected."
+                }
+                correlations.append(correlation)
+        
+        return correlations
+
+
+@register_correlation_rule("near_duplicate_image")
+class NearDuplicateImageRule(CorrelationRule):
+    supports_remove = False
+    
+    def __init__(self, files_data, hash_name=DEFAULT_IMAGE_HASH, max_distance=DEFAULT_IMAGE_HASH_DISTANCE):
+        super().__init__(files_data)
+        self.hash_name = hash_name
+        self.max_distance = max_distance
+        self.index = MultiIndexHash(max_distance=max_distance)
+        self.matches = UnionFind()
+        self.distances = {}
+    
+    def add(self, idx, metadata):
+        image_hash = self.files_data[idx].get("fingerprints", {}).get(self.hash_name)
+        if not image_hash:
+            return
+        value = int(image_hash, 16)
+        
+        # Querying before inserting reports every pair exactly once.
+        for other_idx, distance in self.index.search(value):
+            self.matches.union(other_idx, idx)
+            self.distances[idx] = max(self.distances.get(idx, 0), distance)
+            self.distances[other_idx] = max(self.distances.get(other_idx, 0), distance)
+        self.index.add(value, idx)
     
-    for soft, file_indices in software.items():
-        if len(file_indices) > 1:
-            confidence = min(85, 45 + (len(file_indices) * 10))
+    def build(self):
+        correlations = []
+        
+        for file_indices in self.matches.groups():
+            max_distance = max(self.distances.get(i, 0) for i in file_indices)
+            similarity = round(100 * (1 - max_distance / 64))
+            confidence = min(95, 55 + (len(file_indices) * 10) - max_distance * 2)
             
             correlation = {
-                "type": "software_match",
-                "matched_value": soft,
+                "type": "near_duplicate_image",
+                "matched_field": self.hash_name,
+                "matched_value": f"{similarity}% visual similarity",
                 "file_count": len(file_indices),
                 "file_indices": file_indices,
+                "files": self.file_names(file_indices),
+                "max_distance": max_distance,
                 "confidence": confidence,
-                "explanation": f"{len(file_indices)} files created with {soft}. Same software used to create files."
+                "explanation": f"{len(file_indices)} images look alike ({self.hash_name} differs by at most {max_distance} of 64 bits). Likely resized or recompressed copies of the same picture."
             }
             correlations.append(correlation)
-    
-    return correlations
+        
+        return correlations
 
 
-def find_timestamp_patterns(files_data):
-    correlations = []
-    timestamps = {}
+@register_correlation_rule("similar_documents")
+class SimilarDocumentsRule(CorrelationRule):
+    supports_remove = False
     
-    for idx, file_entry in enumerate(files_data):
-        metadata = file_entry.get("metadata", {})
-        created_time = metadata.get("created_time")
+    def __init__(self, files_data, min_similarity=DEFAULT_DOCUMENT_SIMILARITY, bands=16, rows=4):
+        super().__init__(files_data)
+        self.min_similarity = min_similarity
+        self.index = MinHashLSH(bands, rows)
+        self.signatures = {}
+        self.matches = UnionFind()
+        self.similarities = {}
+    
+    def add(self, idx, metadata):
+        digest = self.files_data[idx].get("fingerprints", {}).get("minhash")
+        if not digest:
+            return
+        signature = parse_minhash(digest)
+        self.signatures[idx] = signature
         
-        if created_time:
-            if created_time not in timestamps:
-                timestamps[created_time] = []
-            timestamps[created_time].append(idx)
+        checked = set()
+        for other_idx in self.index.add(signature, idx):
+            if other_idx in checked:
+                continue
+            checked.add(other_idx)
+            similarity = estimate_similarity(signature, self.signatures[other_idx])
+            if similarity >= self.min_similarity:
+                self.matches.union(other_idx, idx)
+                for i in (idx, other_idx):
+                    self.similarities[i] = min(self.similarities.get(i, 1.0), similarity)
     
-    for timestamp, file_indices in timestamps.items():
-        if len(file_indices) > 1:
+    def build(self):
+        correlations = []
+        
+        for file_indices in self.matches.groups():
+            similarity = round(100 * min(self.similarities.get(i, 1.0) for i in file_indices))
+            confidence = min(90, 30 + similarity // 2 + (len(file_indices) * 5))
+            
             correlation = {
-                "type": "timestamp_pattern",
-                "matched_value": timestamp,
+                "type": "similar_documents",
+                "matched_field": "minhash",
+                "matched_value": f"{similarity}% estimated content overlap",
                 "file_count": len(file_indices),
                 "file_indices": file_indices,
-                "confidence": 75,
-                "explanation": f"{len(file_indices)} files created at exact same time ({timestamp}). Suspicious timestamp pattern detected."
+                "files": self.file_names(file_indices),
+                "similarity": similarity,
+                "confidence": confidence,
+                "explanation": f"{len(file_indices)} documents share at least {similarity}% of their content chunks. Likely edited versions of the same document."
             }
             correlations.append(correlation)
+        
+        return correlations
+
+
+@register_correlation_rule("duplicate_content")
+class DuplicateContentRule(CorrelationRule):
+    def document_values(self, idx, metadata):
+        file_entry = self.files_data[idx]
+        sha256 = file_entry.get("hashes", {}).get("sha256", "")
+        if file_entry.get("hash_status", "full") == "full" and metadata.get("file_size") and sha256 and not sha256.startswith("Error"):
+            yield "sha256", sha256
     
-    return correlations
+    def build_group(self, field_name, sha256, postings):
+        file_indices = postings.tolist()
+        
+        return {
+            "type": "duplicate_content",
+            "matched_field": "sha256",
+            "matched_value": sha256,
+            "file_count": len(file_indices),
+            "file_indices": file_indices,
+            "files": self.file_names(file_indices),
+            "confidence": 99,
+            "explanation": f"{len(file_indices)} files have identical content (SHA-256 {sha256[:16]}...). Exact copies of the same file."
+        }
 
 
-def analyze_correlations(case_data):
-    files_data = case_data.get("files", [])
+def default_correlation_rules():
+    return [name for name, rule_class in CORRELATION_RULES.items() if rule_class.enabled_by_default]
+
+
+class CorrelationEngine:
+    def __init__(self, rule_names=None, rule_options=None):
+        self.rule_names = list(rule_names) if rule_names is not None else default_correlation_rules()
+        self.rule_options = rule_options or {}
+        for name in self.rule_names:
+            if name not in CORRELATION_RULES:
+                raise ValueError(f"Unknown correlation rule: {name}")
+        
+        # Rules see stable document ids; positions in the case file list shift when files are removed.
+        self.documents = {}
+        self.doc_ids = []
+        self.positions = {}
+        self.next_doc_id = 0
+        self.rules = {name: self._new_rule(name) for name in self.rule_names}
+        self.seconds = dict.fromkeys(self.rule_names, 0.0)
+    
+    def _new_rule(self, name):
+        return CORRELATION_RULES[name](self.documents, **self.rule_options.get(name, {}))
+    
+    def _timed(self, name, fn, *args):
+        started = time.perf_counter()
+        result = fn(*args)
+        self.seconds[name] += time.perf_counter() - started
+        return result
     
-    all_correlations = find_matching_metadata(files_data)
+    def add_files(self, files_data):
+        self.seconds = dict.fromkeys(self.rule_names, 0.0)
+        rules = list(self.rules.items())
+        
+        for file_entry in files_data:
+            doc_id = self.next_doc_id
+            self.next_doc_id += 1
+            self.documents[doc_id] = file_entry
+            self.positions[doc_id] = len(self.doc_ids)
+            self.doc_ids.append(doc_id)
+            
+            metadata = file_entry.get("metadata", {})
+            for name, rule in rules:
+                self._timed(name, rule.add, doc_id, metadata)
+    
+    def remove_files(self, file_indices):
+        self.seconds = dict.fromkeys(self.rule_names, 0.0)
+        removed = {self.doc_ids[idx] for idx in file_indices}
+        
+        for doc_id in removed:
+            metadata = self.documents[doc_id].get("metadata", {})
+            for name, rule in self.rules.items():
+                if rule.supports_remove:
+                    self._timed(name, rule.remove, doc_id, metadata)
+        
+        for doc_id in removed:
+            del self.documents[doc_id]
+        self.doc_ids = [doc_id for doc_id in self.doc_ids if doc_id not in removed]
+        self.positions = {doc_id: position for position, doc_id in enumerate(self.doc_ids)}
+        
+        for name, rule in self.rules.items():
+            if not rule.supports_remove:
+                rule = self.rules[name] = self._new_rule(name)
+                for doc_id in self.doc_ids:
+                    self._timed(name, rule.add, doc_id, self.documents[doc_id].get("metadata", {}))
+    
+    def _to_positions(self, correlation):
+        positions = self.positions
+        return dict(correlation, file_indices=[positions[doc_id] for doc_id in correlation["file_indices"]])
+    
+    def correlations(self):
+        identity = self.next_doc_id == len(self.doc_ids)
+        correlations = []
+        timings = {}
+        
+        for name, rule in self.rules.items():
+            found = self._timed(name, rule.build)
+            correlations.extend(found if identity else [self._to_positions(c) for c in found])
+            timings[name] = {"seconds": round(self.seconds[name], 4), "correlations": len(found)}
+        
+        return correlations, timings
+
+
+def run_correlation_rules(files_data, rule_names=None, rule_options=None):
+    engine = CorrelationEngine(rule_names, rule_options)
+    engine.add_files(files_data)
+    return engine.correlations()
+
+
+def find_matching_metadata(files_data, **options):
+    return run_correlation_rules(files_data, ["metadata_match"], {"metadata_match": options})[0]
+
+
+def find_device_correlation(files_data):
+    return run_correlation_rules(files_data, ["device_match"])[0]
+
+
+def find_software_correlation(files_data):
+    return run_correlation_rules(files_data, ["software_match"])[0]
+
+
+def find_timestamp_patterns(files_data):
+    return run_correlation_rules(files_data, ["timestamp_pattern"])[0]
+
+
+def case_correlation_engine(case_data, rebuild=False):
+    engine = case_data.get("_correlation_engine")
+    if engine is None or rebuild:
+        engine = CorrelationEngine(case_data.get("correlation_rules"), case_data.get("correlation_options"))
+        engine.add_files(case_data.get("files", []))
+        case_data["_correlation_engine"] = engine
+    return engine
+
+
+def run_case_correlations(case_data, rebuild=True):
+    all_correlations, timings = case_correlation_engine(case_data, rebuild).correlations()
     all_correlations.sort(key=lambda x: x["confidence"], reverse=True)
     
-    return all_correlations
+    return all_correlations, timings
+
+
+def analyze_correlations(case_data):
+    return run_case_correlations(case_data)[0]
 
 
-def add_correlations_to_case(case_data):
-    correlations = analyze_correlations(case_data)
+def add_correlations_to_case(case_data, rebuild=True):
+    correlations, timings = run_case_correlations(case_data, rebuild)
     case_data["correlations"] = correlations
     case_data["correlation_count"] = len(correlations)
+    case_data["correlation_timings"] = timings
+    # Every change to the files ends here, so this is where cached DataFrame views go stale.
+    case_data.pop("_case_frames", None)
     
     return case_data
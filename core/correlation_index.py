@@ -0,0 +1,172 @@
+from array import array
+from itertools import combinations
+
+
+DEFAULT_STOP_VALUE_RATIO = 0.5
+DEFAULT_STOP_VALUE_MIN_FILES = 50
+DEFAULT_STOP_VALUE_SAMPLE = 10
+
+
+def posting_key(field_id, value):
+    # The type is part of the key so 1, 1.0, True and "1" stay separate groups.
+    try:
+        hash(value)
+    except TypeError:
+        value = str(value)
+    return field_id, value.__class__, value
+
+
+class PostingIndex:
+    def __init__(self, document_count=0):
+        self.field_ids = {}
+        self.field_names = []
+        self.postings = {}
+        self.values = {}
+        self.dirty = {}
+        self.document_count = document_count
+    
+    def intern_field(self, field_name):
+        field_id = self.field_ids.get(field_name)
+        if field_id is None:
+            field_id = len(self.field_names)
+            self.field_ids[field_name] = field_id
+            self.field_names.append(field_name)
+        return field_id
+    
+    def add(self, doc_id, field_name, value):
+        key = posting_key(self.intern_field(field_name), value)
+        postings = self.postings.get(key)
+        if postings is None:
+            postings = self.postings[key] = array("I")
+            self.values[key] = value
+        elif postings[-1] == doc_id:
+            return
+        postings.append(doc_id)
+        self.dirty[key] = None
+        if doc_id >= self.document_count:
+            self.document_count = doc_id + 1
+    
+    def remove(self, doc_id, field_name, value):
+        field_id = self.field_ids.get(field_name)
+        if field_id is None:
+            return
+        key = posting_key(field_id, value)
+        postings = self.postings.get(key)
+        if postings is None or doc_id not in postings:
+            return
+        postings.remove(doc_id)
+        self.dirty[key] = None
+        if not postings:
+            del self.postings[key]
+            del self.values[key]
+    
+    def take_dirty(self):
+        # Keys touched since the last call, in first-touch order.
+        dirty, self.dirty = self.dirty, {}
+        return dirty
+    
+    def field_name(self, key):
+        return self.field_names[key[0]]
+    
+    def stop_value_limit(self, stop_value_ratio=DEFAULT_STOP_VALUE_RATIO, stop_value_min_files=DEFAULT_STOP_VALUE_MIN_FILES):
+        if stop_value_ratio is None:
+            return None
+        return max(stop_value_min_files, int(self.document_count * stop_value_ratio))
+    
+    def iter_groups(self, min_count=2):
+        for key, postings in self.postings.items():
+            if len(postings) >= min_count:
+                yield self.field_name(key), self.values[key], postings
+
+
+class MultiIndexHash:
+    def __init__(self, bits=64, chunks=4, max_distance=7):
+        # Pigeonhole: two hashes within max_distance agree on at least one chunk
+        # to within max_distance // chunks bits, so only those buckets are probed.
+        self.chunk_bits = bits // chunks
+        self.chunk_mask = (1 << self.chunk_bits) - 1
+        self.max_distance = max_distance
+        self.tables = [{} for _ in range(chunks)]
+        self.probes = [0]
+        for radius in range(1, max_distance // chunks + 1):
+            for flipped in combinations(range(self.chunk_bits), radius):
+                self.probes.append(sum(1 << bit for bit in flipped))
+        self.values = []
+        self.items = []
+    
+    def _chunks(self, value):
+        for table_index, table in enumerate(self.tables):
+            yield table, (value >> (table_index * self.chunk_bits)) & self.chunk_mask
+    
+    def add(self, value, item):
+        position = len(self.values)
+        for table, chunk in self._chunks(value):
+            bucket = table.get(chunk)
+            if bucket is None:
+                bucket = table[chunk] = array("I")
+            bucket.append(position)
+        self.values.append(value)
+        self.items.append(item)
+    
+    def search(self, value):
+        seen = set()
+        values = self.values
+        for table, chunk in self._chunks(value):
+            for probe in self.probes:
+                bucket = table.get(chunk ^ probe)
+                if bucket is None:
+                    continue
+                for position in bucket:
+                    if position in seen:
+                        continue
+                    seen.add(position)
+                    distance = bin(value ^ values[position]).count("1")
+                    if distance <= self.max_distance:
+                        yield self.items[position], distance
+
+
+class UnionFind:
+    def __init__(self):
+        self.parent = {}
+    
+    def find(self, item):
+        parent = self.parent.setdefault(item, item)
+        while parent != item:
+            grandparent = self.parent[parent]
+            self.parent[item] = grandparent
+            item, parent = parent, grandparent
+        return item
+    
+    def union(self, first, second):
+        first_root = self.find(first)
+        second_root = self.find(second)
+        if first_root != second_root:
+            if first_root < second_root:
+                self.parent[second_root] = first_root
+            else:
+                self.parent[first_root] = second_root
+    
+    def groups(self):
+        members = {}
+        for item in self.parent:
+            members.setdefault(self.find(item), []).append(item)
+        return [sorted(group) for group in members.values() if len(group) > 1]
+
+
+class MinHashLSH:
+    def __init__(self, bands=16, rows=4):
+        self.bands = bands
+        self.rows = rows
+        self.buckets = [{} for _ in range(bands)]
+    
+    def add(self, signature, item):
+        candidates = []
+        for band, buckets in enumerate(self.buckets):
+            key = tuple(signature[band * self.rows:(band + 1) * self.rows])
+            bucket = buckets.get(key)
+            if bucket is None:
+                buckets[key] = [item]
+            else:
+                candidates.extend(bucket)
+                bucket.append(item)
+        return candidates
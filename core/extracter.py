@@ -3,65 +3,79 @@ import sys
 from pathlib import Path
 from datetime import datetime
 
+from core.signatures import SIGNATURE_HEADER_SIZE, KNOWN_EXTENSIONS, match_signature, is_zip_signature, detect_zip_subtype, claimed_extension
 
-FILE_SIGNATURES = {
-    b'\xFF\xD8\xFF': ['.jpg', '.jpeg'],
-    b'\x89PNG': '.png',
-    b'GIF8': '.gif',
-    b'\x42\x4D': '.bmp',
-    b'%PDF': '.pdf',
-    b'PK\x03\x04': ['.docx', '.xlsx', '.pptx', '.zip'],
-    b'\xFF\xFB': '.mp3',
-    b'ID3': '.mp3',
-    b'\x00\x00\x00\x18ftypmp4': '.mp4',
-    b'{': '.json',
-    b'From:': '.eml',
-}
-
-
-def detect_office_file_type(file_path):
-    try:
-        import zipfile
-        
-        with zipfile.ZipFile(file_path, 'r') as zip_ref:
-            namelist = zip_ref.namelist()
-            
-            if any('ppt/' in name for name in namelist):
-                return '.pptx'
-            elif any('xl/' in name for name in namelist):
-                return '.xlsx'
-            elif any('word/' in name for name in namelist):
-                return '.docx'
-            else:
-                return '.zip'
-    except:
-        return '.zip'
 
+HEADER_SIZE = SIGNATURE_HEADER_SIZE
 
-def detect_file_type(file_path):
+
+def probe_file(file_path, stat=None):
+    probe = {
+        "path": Path(file_path),
+        "stat": stat,
+        "error": None,
+        "header": b"",
+        "zip_type": None,
+        "signature": None
+    }
+    
     try:
+        if probe["stat"] is None:
+            probe["stat"] = os.stat(file_path)
         with open(file_path, 'rb') as f:
-            header = f.read(32)
+            probe["header"] = f.read(HEADER_SIZE)
+    except OSError as e:
+        probe["error"] = e
+    
+    return probe
+
+
+def _detect_zip_extensions(file_path, probe=None):
+    probe = probe or probe_file(file_path)
+    if probe["zip_type"] is None:
+        probe["zip_type"] = detect_zip_subtype(file_path, probe["header"])
+    return probe["zip_type"]
+
+
+def detect_office_file_type(file_path, probe=None):
+    return _detect_zip_extensions(file_path, probe)[0]
+
+
+def detect_file_type(file_path, probe=None):
+    probe = probe or probe_file(file_path)
+    try:
+        if probe["error"] is not None:
+            raise probe["error"]
         
-        for signature, ext_list in FILE_SIGNATURES.items():
-            if header.startswith(signature):
-                exts = ext_list if isinstance(ext_list, list) else [ext_list]
-                
-                if signature == b'PK\x03\x04':
-                    detected = detect_office_file_type(file_path)
-                    return detected, True
-                
-                detected_ext = exts[0]
-                return detected_ext, True
+        signature = match_signature(probe["header"])
+        if signature is None:
+            return Path(file_path).suffix, False
         
-        return Path(file_path).suffix, False
+        if is_zip_signature(signature):
+            extensions = _detect_zip_extensions(file_path, probe)
+        else:
+            extensions = signature["extensions"]
+        
+        claimed = claimed_extension(file_path)
+        if claimed in extensions:
+            return claimed, True
+        if signature["free_naming"] and claimed not in KNOWN_EXTENSIONS:
+            return claimed, True
+        return extensions[0], True
     except:
         return Path(file_path).suffix, False
 
 
-def validate_file_signature(file_path):
-    actual_extension = Path(file_path).suffix.lower()
-    detected_extension, is_real = detect_file_type(file_path)
+def validate_file_signature(file_path, probe=None):
+    probe = probe or probe_file(file_path)
+    if probe["signature"] is None:
+        probe["signature"] = _validate_file_signature(file_path, probe)
+    return probe["signature"]
+
+
+def _validate_file_signature(file_path, probe):
+    actual_extension = claimed_extension(file_path)
+    detected_extension, is_real = detect_file_type(file_path, probe)
     
     if not is_real:
         return {
@@ -71,15 +85,6 @@ def validate_file_signature(file_path):
             "claimed_type": actual_extension
         }
     
-    if actual_extension in ['.jpg', '.jpeg']:
-        if detected_extension in ['.jpg', '.jpeg']:
-            return {
-                "valid": True,
-                "warning": None,
-                "detected_type": detected_extension,
-                "claimed_type": actual_extension
-            }
-    
     if detected_extension != actual_extension:
         return {
             "valid": False,
@@ -96,14 +101,15 @@ def validate_file_signature(file_path):
     }
 
 
-def extract_basic_info(file_path):
+def extract_basic_info(file_path, probe=None):
     info = {}
     
+    probe = probe or probe_file(file_path)
     file_path = Path(file_path)
-    if not file_path.exists():
+    if probe["stat"] is None:
         return {"error": "File not found"}
     
-    stat = file_path.stat()
+    stat = probe["stat"]
     info["file_name"] = file_path.name
     info["file_path"] = str(file_path)
     info["file_size"] = stat.st_size
@@ -115,7 +121,7 @@ def extract_basic_info(file_path):
     info["modified_time"] = modified_dt.strftime("%Y-%m-%d %H:%M:%S")
     info["file_extension"] = file_path.suffix
     
-    sig_info = validate_file_signature(str(file_path))
+    sig_info = validate_file_signature(str(file_path), probe)
     info["signature_valid"] = sig_info["valid"]
     if sig_info["warning"]:
         info["signature_warning"] = sig_info["warning"]
@@ -123,11 +129,14 @@ def extract_basic_info(file_path):
     return info
 
 
-def detect_anomalies(file_path):
+def detect_anomalies(file_path, probe=None):
     anomalies = []
     
+    probe = probe or probe_file(file_path)
     file_path = Path(file_path)
-    stat = file_path.stat()
+    if probe["stat"] is None:
+        raise probe["error"]
+    stat = probe["stat"]
     
     created = float(stat.st_ctime)
     modified = float(stat.st_mtime)
@@ -146,7 +155,7 @@ def detect_anomalies(file_path):
             "severity": "medium"
         })
     
-    sig_info = validate_file_signature(str(file_path))
+    sig_info = validate_file_signature(str(file_path), probe)
     if not sig_info["valid"]:
         anomalies.append({
             "type": "signature_mismatch",
@@ -157,8 +166,15 @@ def detect_anomalies(file_path):
     return anomalies
 
 
-def extract_image_metadata(file_path):
-    info = extract_basic_info(file_path)
+def extract_image_metadata(file_path, probe=None):
+    info = extract_basic_info(file_path, probe)
+    from core.image_fast import read_image_info
+    
+    image_info = read_image_info(file_path)
+    if image_info is not None:
+        info.update(image_info)
+        return info
+    
     from PIL import Image
     from PIL.ExifTags import TAGS
     
@@ -167,7 +183,7 @@ def extract_image_metadata(file_path):
     info["image_size"] = image.size
     info["image_mode"] = image.mode
     
-    exif_data = image._getexif()
+    exif_data = image._getexif() if hasattr(image, "_getexif") else None
     if exif_data:
         for tag_id, value in exif_data.items():
             tag_name = TAGS.get(tag_id, tag_id)
@@ -175,13 +191,22 @@ def extract_image_metadata(file_path):
     return info
 
 
-def extract_pdf_metadata(file_path):
-    info = extract_basic_info(file_path)
+def extract_pdf_metadata(file_path, probe=None):
+    info = extract_basic_info(file_path, probe)
     
-    from PyPDF2 import PdfReader
+    from core.pdf_fast import read_pdf_info
     
-    pdf = PdfReader(file_path)
-    info["pdf_pages"] = len(pdf.pages)
+    pdf_info = read_pdf_info(file_path)
+    if pdf_info is not None:
+        info["pdf_pages"] = pdf_info["pages"]
+        metadata = pdf_info["metadata"]
+    else:
+        # Encrypted or malformed files need PyPDF2's decryption and xref recovery.
+        from PyPDF2 import PdfReader
+        
+        pdf = PdfReader(file_path)
+        info["pdf_pages"] = len(pdf.pages)
+        metadata = pdf.metadata
     
     info["pdf_author"] = ""
     info["pdf_creation_date"] = ""
@@ -190,21 +215,28 @@ def extract_pdf_metadata(file_path):
     info["pdf_title"] = ""
     info["pdf_subject"] = ""
     
-    if pdf.metadata:
-        info["pdf_author"] = pdf.metadata.get("/Author") or ""
-        info["pdf_creation_date"] = pdf.metadata.get("/CreationDate") or ""
-        info["pdf_mod_date"] = pdf.metadata.get("/ModDate") or ""
-        info["pdf_producer"] = pdf.metadata.get("/Producer") or ""
-        info["pdf_title"] = pdf.metadata.get("/Title") or ""
-        info["pdf_subject"] = pdf.metadata.get("/Subject") or ""
+    if metadata:
+        info["pdf_author"] = metadata.get("/Author") or ""
+        info["pdf_creation_date"] = metadata.get("/CreationDate") or ""
+        info["pdf_mod_date"] = metadata.get("/ModDate") or ""
+        info["pdf_producer"] = metadata.get("/Producer") or ""
+        info["pdf_title"] = metadata.get("/Title") or ""
+        info["pdf_subject"] = metadata.get("/Subject") or ""
     
     return info
 
 
-def extract_office_metadata(file_path):
-    info = extract_basic_info(file_path)
+def extract_office_metadata(file_path, probe=None):
+    info = extract_basic_info(file_path, probe)
     extension = Path(file_path).suffix.lower()
     
+    from core.office_fast import read_office_info
+    
+    office_info = read_office_info(file_path, extension)
+    if office_info is not None:
+        info.update(office_info)
+        return info
+    
     if extension == ".docx":
         from docx import Document
         doc = Document(file_path)
@@ -219,9 +251,10 @@ def extract_office_metadata(file_path):
         
     elif extension == ".xlsx":
         from openpyxl import load_workbook
-        wb = load_workbook(file_path)
+        wb = load_workbook(file_path, read_only=True)
         info["excel_sheets"] = len(wb.sheetnames)
         info["excel_sheet_names"] = wb.sheetnames
+        wb.close()
         
     elif extension == ".pptx":
         from pptx import Presentation
@@ -231,61 +264,97 @@ def extract_office_metadata(file_path):
     return info
 
 
-def extract_file_metadata(file_path):
+def extract_file_metadata(file_path, probe=None):
     path = Path(file_path)
     extension = path.suffix.lower()
     
     if extension in [".jpg", ".jpeg", ".png", ".gif", ".bmp"]:
-        return extract_image_metadata(file_path)
+        return extract_image_metadata(file_path, probe)
     elif extension == ".pdf":
-        return extract_pdf_metadata(file_path)
+        return extract_pdf_metadata(file_path, probe)
     elif extension in [".docx", ".xlsx", ".pptx"]:
-        return extract_office_metadata(file_path)
+        return extract_office_metadata(file_path, probe)
     else:
-        return extract_basic_info(file_path)
+        return extract_basic_info(file_path, probe)
 
 
-def extract_multiple_files(file_paths):
-    results = []
-    for file_path in file_paths:
-        metadata = extract_file_metadata(file_path)
-        from core.hash_utils import calculate_all_hashes
-        hashes = calculate_all_hashes(file_path)
-        anomalies = detect_anomalies(file_path)
-        
-        result = {
-            "file_path": file_path,
-            "metadata": metadata,
-            "hashes": hashes,
-            "anomalies": anomalies
-        }
-        results.append(result)
+def extract_fingerprints(file_path):
+    from core.image_hash import IMAGE_HASH_EXTENSIONS, image_fingerprints
+    
+    if Path(file_path).suffix.lower() in IMAGE_HASH_EXTENSIONS:
+        return image_fingerprints(file_path)
+    return {}
+
+
+def parse_file(file_path, stat=None):
+    probe = probe_file(file_path, stat)
+    metadata = extract_file_metadata(file_path, probe)
+    anomalies = detect_anomalies(file_path, probe)
+    fingerprints = extract_fingerprints(file_path)
+    return metadata, anomalies, fingerprints
+
+
+def build_result(file_path, metadata, hashes, anomalies, fingerprints=None, hash_status="full"):
+    return {
+        "file_path": file_path,
+        "metadata": metadata,
+        "hashes": hashes,
+        "hash_status": hash_status,
+        "anomalies": anomalies,
+        "fingerprints": fingerprints or {}
+    }
+
+
+def analyze_file(file_path):
+    from core.hash_utils import calculate_hashes_and_fingerprints
+    metadata, anomalies, fingerprints = parse_file(file_path)
+    hashes, content_fingerprints = calculate_hashes_and_fingerprints(file_path)
+    fingerprints.update(content_fingerprints)
+    return build_result(file_path, metadata, hashes, anomalies, fingerprints)
+
+
+def extract_multiple_files(file_paths, workers=1, triage=False, **pipeline_options):
+    from core.pipeline import iter_extract_files
+    
+    files_data = list(iter_extract_files(file_paths, workers=workers, triage=triage, **pipeline_options))
+    if triage:
+        from core.triage import resolve_duplicate_candidates
+        resolve_duplicate_candidates(files_data, workers)
+    return files_data
+
+
+def list_folder_files(folder_path, recursive=False, **walk_options):
+    from core.walker import walk_files
+    
+    if not Path(folder_path).is_dir():
+        return {"error": "Not a valid folder"}
     
-    return results
+    return list(walk_files(folder_path, recursive=recursive, **walk_options))
 
 
-def scan_folder(folder_path, recursive=False):
-    results = []
-    folder = Path(folder_path)
+def iter_scan_folder(folder_path, recursive=False, analyze=True, walk_options=None, **pipeline_options):
+    from core.walker import iter_folder_entries
+    from core.pipeline import iter_extract_files
+    
+    if not Path(folder_path).is_dir():
+        raise NotADirectoryError(f"Not a valid folder: {folder_path}")
+    
+    entries = iter_folder_entries(folder_path, recursive=recursive, **(walk_options or {}))
     
-    if not folder.is_dir():
+    if not analyze:
+        for file_path, _ in entries:
+            yield file_path
+        return
+    
+    yield from iter_extract_files(entries, **pipeline_options)
+
+
+def scan_folder(folder_path, recursive=False, analyze=True, workers=1, walk_options=None, triage=False, **pipeline_options):
+    if not Path(folder_path).is_dir():
         return {"error": "Not a valid folder"}
     
-    pattern = "**/*" if recursive else "*"
-    
-    for file_path in folder.glob(pattern):
-        if file_path.is_file():
-            metadata = extract_file_metadata(str(file_path))
-            from core.hash_utils import calculate_all_hashes
-            hashes = calculate_all_hashes(str(file_path))
-            anomalies = detect_anomalies(str(file_path))
-            
-            result = {
-                "file_path": str(file_path),
-                "metadata": metadata,
-                "hashes": hashes,
-                "anomalies": anomalies
-            }
-            results.append(result)
-    
-    return results
\ No newline at end of file
+    files_data = list(iter_scan_folder(folder_path, recursive=recursive, analyze=analyze, walk_options=walk_options, workers=workers, triage=triage, **pipeline_options))
+    if analyze and triage:
+        from core.triage import resolve_duplicate_candidates
+        resolve_duplicate_candidates(files_data, workers)
+    return files_data
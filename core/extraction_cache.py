@@ -0,0 +1,134 @@
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+
+# Bump whenever extraction results gain or change fields, so older cached rows are not served.
+EXTRACTOR_VERSION = 3
+CACHE_MAX_ENTRIES = 250000
+CACHE_MAX_BYTES = 512 * 1024 * 1024
+CACHE_COMMIT_INTERVAL = 500
+
+
+def default_cache_dir():
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+        return Path(base) / "MetaTrace" / "cache"
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "metatrace"
+
+
+def open_extraction_cache(db_path=None):
+    db_path = Path(db_path) if db_path else default_cache_dir() / "extraction_cache.sqlite3"
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    conn = sqlite3.connect(str(db_path), check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    if conn.execute("PRAGMA user_version").fetchone()[0] != EXTRACTOR_VERSION:
+        # Rows from another extractor version lack or misshape result fields; rebuilding is cheaper than migrating.
+        conn.execute("DROP TABLE IF EXISTS extraction_cache")
+        conn.execute(f"PRAGMA user_version = {EXTRACTOR_VERSION}")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS extraction_cache (
+            st_dev INTEGER NOT NULL,
+            st_ino INTEGER NOT NULL,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            ctime_ns INTEGER NOT NULL,
+            file_path TEXT NOT NULL,
+            result TEXT NOT NULL,
+            result_bytes INTEGER NOT NULL,
+            last_used REAL NOT NULL,
+            PRIMARY KEY (st_dev, st_ino, size, mtime_ns, ctime_ns)
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_extraction_cache_last_used ON extraction_cache (last_used)")
+    conn.commit()
+    return conn
+
+
+def file_identity(stat):
+    return (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns, stat.st_ctime_ns)
+
+
+def normalize_result(result):
+    # Results take the shape they have after a trip through the cache (tuples become lists,
+    # dates become strings), so a cache hit and a fresh extraction compare and correlate alike.
+    return json.loads(json.dumps(result, default=str))
+
+
+def lookup_cached_extraction(conn, identity):
+    row = conn.execute(
+        "SELECT result FROM extraction_cache WHERE st_dev=? AND st_ino=? AND size=? AND mtime_ns=? AND ctime_ns=?",
+        identity
+    ).fetchone()
+    
+    if row is None:
+        return None
+    
+    conn.execute(
+        "UPDATE extraction_cache SET last_used=? WHERE st_dev=? AND st_ino=? AND size=? AND mtime_ns=? AND ctime_ns=?",
+        (time.time(), *identity)
+    )
+    return json.loads(row[0])
+
+
+def store_cached_extraction(conn, identity, file_path, result):
+    payload = json.dumps(result, default=str)
+    conn.execute(
+        "INSERT OR REPLACE INTO extraction_cache VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (*identity, os.path.abspath(file_path), payload, len(payload), time.time())
+    )
+
+
+def discard_cached_extraction(conn, identity):
+    conn.execute(
+        "DELETE FROM extraction_cache WHERE st_dev=? AND st_ino=? AND size=? AND mtime_ns=? AND ctime_ns=?",
+        identity
+    )
+
+
+def evict_extraction_cache(conn, max_entries=CACHE_MAX_ENTRIES, max_bytes=CACHE_MAX_BYTES):
+    count, total_bytes = conn.execute(
+        "SELECT COUNT(*), COALESCE(SUM(result_bytes), 0) FROM extraction_cache"
+    ).fetchone()
+    
+    removed = 0
+    if count > max_entries:
+        excess = count - max_entries
+        conn.execute(
+            "DELETE FROM extraction_cache WHERE rowid IN (SELECT rowid FROM extraction_cache ORDER BY last_used LIMIT ?)",
+            (excess,)
+        )
+        removed += excess
+        total_bytes = conn.execute("SELECT COALESCE(SUM(result_bytes), 0) FROM extraction_cache").fetchone()[0]
+    
+    if total_bytes > max_bytes:
+        to_free = total_bytes - max_bytes
+        freed = 0
+        stale = []
+        for rowid, result_bytes in conn.execute("SELECT rowid, result_bytes FROM extraction_cache ORDER BY last_used"):
+            if freed >= to_free:
+                break
+            stale.append((rowid,))
+            freed += result_bytes
+        conn.executemany("DELETE FROM extraction_cache WHERE rowid=?", stale)
+        removed += len(stale)
+    
+    conn.commit()
+    return removed
+
+
+def clear_extraction_cache(conn):
+    conn.execute("DELETE FROM extraction_cache")
+    conn.commit()
+
+
+def get_extraction_cache_stats(conn):
+    count, total_bytes = conn.execute(
+        "SELECT COUNT(*), COALESCE(SUM(result_bytes), 0) FROM extraction_cache"
+    ).fetchone()
+    return {"entries": count, "bytes": total_bytes}
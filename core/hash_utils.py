@@ -1,20 +1,75 @@
 import hashlib
+import threading
+import time
 
 
-def calculate_file_hash(file_path, algorithm="sha256"):
-    hash_obj = hashlib.new(algorithm)
+HASH_ALGORITHMS = ["md5", "sha1", "sha256", "sha512"]
+HASH_BUFFER_SIZE = 1024 * 1024
+
+_thread_buffers = threading.local()
+
+
+def _get_read_buffer(buffer_size):
+    buffer = getattr(_thread_buffers, "buffer", None)
+    if buffer is None or len(buffer) != buffer_size:
+        buffer = bytearray(buffer_size)
+        _thread_buffers.buffer = buffer
+    return buffer
+
+
+def hash_file(file_path, algorithms=None, buffer_size=HASH_BUFFER_SIZE, similarity=False):
+    algorithms = list(algorithms or HASH_ALGORITHMS)
+    hash_objs = [hashlib.new(algo) for algo in algorithms]
+    digest = None
+    if similarity:
+        from core.similarity import new_similarity_digest
+        digest = new_similarity_digest(file_path)
+    
+    buffer = _get_read_buffer(buffer_size)
+    view = memoryview(buffer)
+    bytes_read = 0
+    error = None
+    start = time.perf_counter()
     
     try:
-        with open(file_path, "rb") as f:
-            while chunk := f.read(8192):
-                hash_obj.update(chunk)
-        return hash_obj.hexdigest()
+        with open(file_path, "rb", buffering=0) as f:
+            while n := f.readinto(buffer):
+                chunk = view[:n]
+                for hash_obj in hash_objs:
+                    hash_obj.update(chunk)
+                if digest is not None:
+                    digest.update(chunk)
+                bytes_read += n
     except Exception as e:
-        return f"Error: {str(e)}"
+        error = f"Error: {str(e)}"
+    finally:
+        view.release()
+    
+    elapsed = time.perf_counter() - start
+    
+    if error:
+        hashes = {algo: error for algo in algorithms}
+    else:
+        hashes = {algo: hash_obj.hexdigest() for algo, hash_obj in zip(algorithms, hash_objs)}
+    
+    return {
+        "hashes": hashes,
+        "similarity": digest.hexdigest() if digest is not None and not error else None,
+        "bytes_hashed": bytes_read,
+        "seconds": elapsed,
+        "mb_per_sec": (bytes_read / (1024 * 1024)) / elapsed if elapsed > 0 else 0.0
+    }
+
+
+def calculate_file_hash(file_path, algorithm="sha256"):
+    return hash_file(file_path, [algorithm])["hashes"][algorithm]
 
 
 def calculate_all_hashes(file_path):
-    hashes = {}
-    for algo in ["md5", "sha1", "sha256", "sha512"]:
-        hashes[algo] = calculate_file_hash(file_path, algo)
-    return hashes
\ No newline at end of file
+    return hash_file(file_path, HASH_ALGORITHMS)["hashes"]
+
+
+def calculate_hashes_and_fingerprints(file_path):
+    result = hash_file(file_path, HASH_ALGORITHMS, similarity=True)
+    fingerprints = {"minhash": result["similarity"]} if result["similarity"] else {}
+    return result["hashes"], fingerprints
@@ -0,0 +1,484 @@
+import io
+import re
+import struct
+import zlib
+
+
+EXIF_IFD = 0x8769
+GPS_IFD = 0x8825
+ORIENTATION_TAG = 0x0112
+RESOLUTION_UNIT_TAG = 0x0128
+X_RESOLUTION_TAG = 0x011A
+
+VALUE_PREVIEW_LENGTH = 100
+BLOB_READ_LIMIT = 4096
+BLOB_PREVIEW_SIZE = VALUE_PREVIEW_LENGTH + 1
+TEXT_CHUNK_LIMIT = 64 * 1024
+TEXT_PREVIEW_SIZE = 4 * VALUE_PREVIEW_LENGTH
+
+TIFF_PREFIXES = [b"MM\x00\x2a", b"II\x2a\x00", b"MM\x2a\x00", b"II\x00\x2a"]
+TIFF_TYPES = {
+    1: (1, None),
+    2: (1, None),
+    3: (2, "H"),
+    4: (4, "L"),
+    5: (8, "L"),
+    6: (1, "b"),
+    7: (1, None),
+    8: (2, "h"),
+    9: (4, "l"),
+    10: (8, "l"),
+    11: (4, "f"),
+    12: (8, "d"),
+    13: (4, "L"),
+    16: (8, "Q"),
+}
+
+JPEG_MODES = {1: "L", 3: "RGB", 4: "CMYK"}
+JPEG_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+JPEG_STANDALONE_MARKERS = {0x01} | set(range(0xD0, 0xD9))
+XMP_PREFIX = b"http://ns.adobe.com/xap/1.0/\x00"
+XMP_ORIENTATION = re.compile(rb'tiff:Orientation(="|>)([0-9])')
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+RAW_EXIF_PROFILE = b"Raw profile type exif"
+RAW_EXIF_PROFILE_LIMIT = 1024 * 1024
+PNG_MODES = {
+    (1, 0): "1",
+    (2, 0): "L",
+    (4, 0): "L",
+    (8, 0): "L",
+    (16, 0): "I;16",
+    (8, 2): "RGB",
+    (16, 2): "RGB",
+    (1, 3): "P",
+    (2, 3): "P",
+    (4, 3): "P",
+    (8, 3): "P",
+    (8, 4): "LA",
+    (16, 4): "RGBA",
+    (8, 6): "RGBA",
+    (16, 6): "RGBA",
+}
+
+BMP_MODES = {1: "P", 4: "P", 8: "P", 16: "RGB", 24: "RGB", 32: "RGB"}
+BMP_RAW_COMPRESSIONS = (0, 1, 2)
+BYTE_ESCAPES = {0x09: "\\t", 0x0A: "\\n", 0x0D: "\\r", 0x27: "\\'", 0x5C: "\\\\"}
+
+
+class ImageFormatError(Exception):
+    pass
+
+
+class _Window:
+    def __init__(self, f, pieces, base=0):
+        self.f = f
+        self.pieces = pieces
+        self.base = base
+        self.length = sum(length for _, length in pieces) - base
+    
+    def read(self, offset, size):
+        if offset < 0:
+            return b""
+        offset += self.base
+        out = bytearray()
+        for start, length in self.pieces:
+            if size <= 0:
+                break
+            if offset >= length:
+                offset -= length
+                continue
+            chunk = min(size, length - offset)
+            self.f.seek(start + offset)
+            data = self.f.read(chunk)
+            out += data
+            if len(data) < chunk:
+                break
+            size -= chunk
+            offset = 0
+        return bytes(out)
+
+
+def _rational(numerator, denominator):
+    if denominator == 0:
+        return float("nan")
+    return numerator / denominator
+
+
+def _escape_byte(value):
+    if value in BYTE_ESCAPES:
+        return BYTE_ESCAPES[value]
+    return chr(value) if 0x20 <= value < 0x7F else f"\\x{value:02x}"
+
+
+def _blob_preview(data):
+    # Only the start of a large blob is read, so its repr() is written out by hand. Blobs that
+    # size hold both quote characters, for which Python picks single quotes and escapes them.
+    return "b'" + "".join(_escape_byte(value) for value in data)
+
+
+def _decode_tiff_value(endian, tag_type, data, truncated):
+    unit, fmt = TIFF_TYPES[tag_type]
+    if tag_type == 2:
+        if not truncated and data.endswith(b"\0"):
+            data = data[:-1]
+        return (data.decode("latin-1", "replace"),)
+    if tag_type in (1, 7):
+        return (_blob_preview(data) if truncated else data,)
+    values = struct.unpack(f"{endian}{len(data) // unit * (2 if tag_type in (5, 10) else 1)}{fmt}", data)
+    if tag_type in (5, 10):
+        return tuple(_rational(a, b) for a, b in zip(values[::2], values[1::2]))
+    return values
+
+
+def _read_ifd(window, endian, offset, group):
+    from PIL import TiffTags
+    
+    if not isinstance(offset, int):
+        return None
+    
+    count_data = window.read(offset, 2)
+    if len(count_data) < 2:
+        return {}
+    (count,) = struct.unpack(endian + "H", count_data)
+    
+    entries = {}
+    for index in range(count):
+        entry = window.read(offset + 2 + index * 12, 12)
+        if len(entry) < 12:
+            break
+        tag, tag_type, value_count, data = struct.unpack(endian + "HHL4s", entry)
+        if tag_type not in TIFF_TYPES:
+            continue
+        
+        size = value_count * TIFF_TYPES[tag_type][0]
+        truncated = False
+        if size > 4:
+            (value_offset,) = struct.unpack(endian + "L", data)
+            if value_offset + size > window.length:
+                break
+            if tag_type in (1, 2, 7) and size > BLOB_READ_LIMIT:
+                # MakerNote, thumbnails and other blobs: only the part that survives
+                # the 100 character cut is read.
+                size = BLOB_PREVIEW_SIZE
+                truncated = True
+            data = window.read(value_offset, size)
+        else:
+            data = data[:size]
+        if not data:
+            continue
+        entries[tag] = (tag_type, data, truncated)
+    
+    ifd = {}
+    for tag, (tag_type, data, truncated) in entries.items():
+        values = _decode_tiff_value(endian, tag_type, data, truncated)
+        if len(values) == 1 or TiffTags.lookup(tag, group).length == 1:
+            ifd[tag] = values[0]
+        else:
+            ifd[tag] = values
+    return ifd
+
+
+def read_exif(window, xmp=None, jfif_dpi=True):
+    from PIL.ExifTags import TAGS
+    
+    skip = 0
+    while window.read(skip, 6) == b"Exif\0\0":
+        skip += 6
+    window = _Window(window.f, window.pieces, window.base + skip)
+    if window.length <= 0:
+        return {}
+    
+    head = window.read(0, 8)
+    if head[:4] not in TIFF_PREFIXES or len(head) < 8:
+        raise ImageFormatError("EXIF block is not a TIFF structure")
+    endian = ">" if head[:2] == b"MM" else "<"
+    (first_ifd,) = struct.unpack(endian + "L", head[4:8])
+    
+    ifd0 = _read_ifd(window, endian, first_ifd, None)
+    moved = {}
+    if ORIENTATION_TAG not in ifd0 and xmp:
+        match = XMP_ORIENTATION.search(xmp)
+        if match:
+            moved[ORIENTATION_TAG] = int(match.group(2))
+    if not jfif_dpi:
+        # Pillow reads the resolution tags while opening a JPEG without JFIF dpi.
+        for tag in (RESOLUTION_UNIT_TAG, X_RESOLUTION_TAG):
+            if tag not in ifd0:
+                break
+            moved[tag] = ifd0[tag]
+    
+    # Tags are kept in ascending order, the order TIFF requires inside an IFD.
+    merged = {tag: moved[tag] if tag in moved else ifd0[tag] for tag in sorted(set(ifd0) | set(moved))}
+    
+    if EXIF_IFD in merged:
+        exif_ifd = _read_ifd(window, endian, merged[EXIF_IFD], EXIF_IFD)
+        if exif_ifd:
+            merged.update({tag: exif_ifd[tag] for tag in sorted(exif_ifd)})
+    if GPS_IFD in merged:
+        gps_ifd = _read_ifd(window, endian, merged[GPS_IFD], GPS_IFD)
+        merged[GPS_IFD] = gps_ifd if gps_ifd is None else {tag: gps_ifd[tag] for tag in sorted(gps_ifd)}
+    
+    return {f"exif_{TAGS.get(tag_id, tag_id)}": str(value)[:VALUE_PREVIEW_LENGTH] for tag_id, value in merged.items()}
+
+
+def _read_jpeg(f):
+    exif_pieces = []
+    xmp_piece = None
+    jfif_dpi = False
+    size = mode = None
+    
+    pos = 2
+    while True:
+        f.seek(pos)
+        marker = f.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            raise ImageFormatError("JPEG marker expected")
+        code = marker[1]
+        if code == 0xFF:
+            pos += 1
+            continue
+        if code in JPEG_STANDALONE_MARKERS:
+            pos += 2
+            continue
+        if code == 0xDA:
+            break
+        
+        length_data = f.read(2)
+        if len(length_data) < 2:
+            raise ImageFormatError("truncated JPEG segment")
+        payload = pos + 4
+        payload_length = struct.unpack(">H", length_data)[0] - 2
+        if payload_length < 0:
+            raise ImageFormatError("bad JPEG segment length")
+        
+        if code == 0xE0:
+            head = f.read(min(payload_length, 8))
+            if head[:4] == b"JFIF" and len(head) > 7 and head[7] in (1, 2):
+                jfif_dpi = True
+        elif code == 0xE1:
+            head = f.read(min(payload_length, len(XMP_PREFIX)))
+            if head.startswith(b"Exif\0\0"):
+                if exif_pieces:
+                    exif_pieces.append((payload + 6, payload_length - 6))
+                else:
+                    exif_pieces.append((payload, payload_length))
+            elif head.startswith(XMP_PREFIX):
+                xmp_piece = (payload + len(XMP_PREFIX), payload_length - len(XMP_PREFIX))
+        elif code == 0xE2:
+            if f.read(min(payload_length, 4)) == b"MPF\0":
+                raise ImageFormatError("multi-picture JPEG")
+        elif code in JPEG_SOF_MARKERS:
+            frame = f.read(min(payload_length, 6))
+            if len(frame) < 6 or frame[0] != 8 or frame[5] not in JPEG_MODES:
+                raise ImageFormatError("unsupported JPEG frame")
+            height, width = struct.unpack(">HH", frame[1:5])
+            size = (width, height)
+            mode = JPEG_MODES[frame[5]]
+        
+        pos = payload + payload_length
+    
+    if size is None:
+        raise ImageFormatError("JPEG frame header not found")
+    
+    info = {"image_format": "JPEG", "image_size": size, "image_mode": mode}
+    if exif_pieces:
+        xmp = None
+        if xmp_piece is not None:
+            f.seek(xmp_piece[0])
+            xmp = f.read(xmp_piece[1])
+        info.update(read_exif(_Window(f, exif_pieces), xmp, jfif_dpi))
+    return info
+
+
+def _png_text(chunk_type, data, limit=TEXT_PREVIEW_SIZE):
+    keyword, _, rest = data.partition(b"\0")
+    if chunk_type == b"tEXt":
+        text = rest[:limit].decode("latin-1")
+    elif chunk_type == b"zTXt":
+        if not rest or rest[0] != 0:
+            return None
+        text = zlib.decompressobj().decompress(rest[1:], limit).decode("latin-1")
+    else:
+        if len(rest) < 2:
+            return None
+        compressed, method = rest[0], rest[1]
+        parts = rest[2:].split(b"\0", 2)
+        if len(parts) < 3:
+            return None
+        text = parts[2]
+        if compressed:
+            if method != 0:
+                return None
+            text = zlib.decompressobj().decompress(text, limit)
+        text = text[:limit].decode("utf-8", "replace")
+    return keyword.decode("latin-1"), text
+
+
+def _read_png(f):
+    f.seek(8)
+    header = f.read(8 + 13)
+    if len(header) < 21 or header[4:8] != b"IHDR":
+        raise ImageFormatError("PNG IHDR chunk missing")
+    width, height, bit_depth, color_type = struct.unpack(">IIBB", header[8:18])
+    mode = PNG_MODES.get((bit_depth, color_type))
+    if mode is None:
+        raise ImageFormatError("unsupported PNG bit depth/colour type")
+    
+    info = {"image_format": "PNG", "image_size": (width, height), "image_mode": mode}
+    exif_piece = None
+    raw_exif_profile = None
+    text = {}
+    
+    pos = 8 + 12 + 13
+    while True:
+        f.seek(pos)
+        chunk_header = f.read(8)
+        if len(chunk_header) < 8:
+            break
+        length = struct.unpack(">I", chunk_header[:4])[0]
+        chunk_type = chunk_header[4:]
+        if chunk_type == b"IEND":
+            break
+        if chunk_type in (b"tEXt", b"zTXt", b"iTXt"):
+            # ImageMagick and GIMP store EXIF as a hex dump in this text chunk.
+            is_exif_profile = f.read(len(RAW_EXIF_PROFILE) + 1) == RAW_EXIF_PROFILE + b"\0"
+            limit = RAW_EXIF_PROFILE_LIMIT if is_exif_profile else TEXT_PREVIEW_SIZE
+            if length <= (RAW_EXIF_PROFILE_LIMIT if is_exif_profile else TEXT_CHUNK_LIMIT):
+                f.seek(pos + 8)
+                try:
+                    entry = _png_text(chunk_type, f.read(length), limit)
+                except zlib.error:
+                    entry = None
+                if entry is not None:
+                    text.setdefault(entry[0], entry[1])
+                    if is_exif_profile and raw_exif_profile is None:
+                        raw_exif_profile = entry[1]
+        elif chunk_type == b"eXIf" and exif_piece is None:
+            exif_piece = (pos + 8, length)
+        pos += 12 + length
+    
+    for keyword, value in text.items():
+        info[f"png_{keyword}"] = value[:VALUE_PREVIEW_LENGTH]
+    if exif_piece is not None:
+        info.update(read_exif(_Window(f, [exif_piece])))
+    elif raw_exif_profile is not None:
+        data = bytes.fromhex("".join(raw_exif_profile.split("\n")[3:]))
+        info.update(read_exif(_Window(io.BytesIO(data), [(0, len(data))])))
+    return info
+
+
+def _gif_palette_needed(palette):
+    return any(not (i // 3 == palette[i] == palette[i + 1] == palette[i + 2]) for i in range(0, len(palette) - 2, 3))
+
+
+def _read_gif(f):
+    f.seek(0)
+    header = f.read(13)
+    if len(header) < 13:
+        raise ImageFormatError("truncated GIF header")
+    width, height = struct.unpack("<HH", header[6:10])
+    flags = header[10]
+    
+    has_palette = False
+    pos = 13
+    if flags & 0x80:
+        palette = f.read(3 << ((flags & 7) + 1))
+        has_palette = _gif_palette_needed(palette)
+        pos += len(palette)
+    
+    comments = []
+    while True:
+        f.seek(pos)
+        introducer = f.read(1)
+        if introducer == b"!":
+            label = f.read(1)
+            pos += 2
+            block = b""
+            while True:
+                f.seek(pos)
+                block_size = f.read(1)
+                if not block_size:
+                    raise ImageFormatError("truncated GIF extension")
+                pos += 1 + block_size[0]
+                if block_size[0] == 0:
+                    break
+                if label == b"\xfe" and len(block) < TEXT_PREVIEW_SIZE:
+                    block += f.read(block_size[0])
+            if label == b"\xfe":
+                comments.append(block)
+        elif introducer == b",":
+            descriptor = f.read(9)
+            if len(descriptor) < 9:
+                raise ImageFormatError("truncated GIF image descriptor")
+            if descriptor[8] & 0x80:
+                local_palette = f.read(3 << ((descriptor[8] & 7) + 1))
+                if _gif_palette_needed(local_palette):
+                    has_palette = True
+            break
+        else:
+            raise ImageFormatError("GIF image descriptor not found")
+    
+    info = {"image_format": "GIF", "image_size": (width, height), "image_mode": "P" if has_palette else "L"}
+    if comments:
+        info["gif_comment"] = b"\n".join(comments).decode("latin-1")[:VALUE_PREVIEW_LENGTH]
+    return info
+
+
+def _read_bmp(f):
+    f.seek(14)
+    header_size_data = f.read(4)
+    if len(header_size_data) < 4:
+        raise ImageFormatError("truncated BMP header")
+    (header_size,) = struct.unpack("<I", header_size_data)
+    
+    if header_size == 12:
+        width, height, _, bits = struct.unpack("<HHHH", f.read(8))
+        compression = 0
+        colors = 0
+        palette_padding = 3
+    elif header_size in (40, 52, 56, 64, 108, 124):
+        header = f.read(32)
+        if len(header) < 32:
+            raise ImageFormatError("truncated BMP header")
+        width, height, _, bits, compression = struct.unpack("<IiHHI", header[:16])
+        (colors,) = struct.unpack("<I", header[28:32])
+        height = abs(height)
+        palette_padding = 4
+    else:
+        raise ImageFormatError("unsupported BMP header")
+    
+    mode = BMP_MODES.get(bits)
+    if mode is None or compression not in BMP_RAW_COMPRESSIONS:
+        raise ImageFormatError("unsupported BMP layout")
+    
+    if mode == "P":
+        colors = colors or 1 << bits
+        if not 0 < colors <= 256:
+            raise ImageFormatError("unsupported BMP palette")
+        f.seek(14 + header_size)
+        palette = f.read(palette_padding * colors)
+        indices = (0, 255) if colors == 2 else range(colors)
+        grayscale = all(palette[i * palette_padding:i * palette_padding + 3] == bytes([value]) * 3
+                        for i, value in enumerate(indices))
+        if grayscale:
+            mode = "1" if colors == 2 else "L"
+    
+    return {"image_format": "BMP", "image_size": (width, height), "image_mode": mode}
+
+
+def read_image_info(file_path):
+    try:
+        with open(file_path, "rb") as f:
+            signature = f.read(8)
+            if signature[:3] == b"\xff\xd8\xff":
+                return _read_jpeg(f)
+            if signature == PNG_SIGNATURE:
+                return _read_png(f)
+            if signature[:6] in (b"GIF87a", b"GIF89a"):
+                return _read_gif(f)
+            if signature[:2] == b"BM":
+                return _read_bmp(f)
+    except (OSError, ImageFormatError, struct.error, ValueError):
+        return None
+    return None
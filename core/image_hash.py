@@ -0,0 +1,70 @@
+import math
+
+
+IMAGE_HASH_EXTENSIONS = [".jpg", ".jpeg", ".png", ".gif", ".bmp"]
+HASH_SIZE = 8
+PHASH_FACTOR = 4
+DRAFT_SIZE = (HASH_SIZE * PHASH_FACTOR * 2, HASH_SIZE * PHASH_FACTOR * 2)
+
+
+def _bits_to_hex(bits):
+    value = 0
+    for bit in bits:
+        value = (value << 1) | bit
+    return f"{value:0{len(bits) // 4}x}"
+
+
+def dhash(image, hash_size=HASH_SIZE):
+    from PIL import Image
+    
+    small = image.resize((hash_size + 1, hash_size), Image.Resampling.LANCZOS)
+    pixels = small.tobytes()
+    width = hash_size + 1
+    bits = []
+    for row in range(hash_size):
+        offset = row * width
+        for col in range(hash_size):
+            bits.append(1 if pixels[offset + col] < pixels[offset + col + 1] else 0)
+    return _bits_to_hex(bits)
+
+
+def _dct_matrix(size):
+    import numpy
+    
+    n = numpy.arange(size)
+    matrix = numpy.cos(numpy.pi * (2 * n[None, :] + 1) * n[:, None] / (2 * size))
+    matrix[0] *= 1 / math.sqrt(2)
+    return matrix * math.sqrt(2 / size)
+
+
+def phash(image, hash_size=HASH_SIZE, factor=PHASH_FACTOR):
+    import numpy
+    from PIL import Image
+    
+    size = hash_size * factor
+    small = image.resize((size, size), Image.Resampling.LANCZOS)
+    pixels = numpy.asarray(small, dtype=numpy.float64)
+    dct = _dct_matrix(size)
+    coefficients = (dct @ pixels @ dct.T)[:hash_size, :hash_size]
+    median = numpy.median(coefficients.flatten()[1:])
+    return _bits_to_hex([1 if value > median else 0 for value in coefficients.flatten()])
+
+
+def image_fingerprints(file_path):
+    from PIL import Image
+    
+    fingerprints = {}
+    try:
+        with Image.open(file_path) as image:
+            # JPEG can decode straight to a reduced scale, which is all a 32x32 hash needs.
+            image.draft("L", DRAFT_SIZE)
+            gray = image.convert("L")
+        fingerprints["dhash"] = dhash(gray)
+        try:
+            fingerprints["phash"] = phash(gray)
+        except ImportError:
+            pass
+    except Exception:
+        return {}
+    
+    return fingerprints
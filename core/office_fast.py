@@ -0,0 +1,151 @@
+import posixpath
+import re
+import zipfile
+from datetime import datetime, timedelta, timezone
+from xml.etree import ElementTree
+
+
+RELS_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+CORE_NS = {
+    "cp": "http://schemas.openxmlformats.org/package/2006/metadata/core-properties",
+    "dc": "http://purl.org/dc/elements/1.1/",
+    "dcterms": "http://purl.org/dc/terms/",
+}
+WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+SHEET_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+PRESENTATION_NS = "{http://schemas.openxmlformats.org/presentationml/2006/main}"
+
+OFFICE_DOCUMENT_REL = "/officeDocument"
+CORE_PROPERTIES_REL = "/metadata/core-properties"
+
+_W3CDTF_FORMATS = ("%Y-%m-%dT%H:%M:%S", "%Y-%m-%d", "%Y-%m", "%Y")
+_W3CDTF_OFFSET = re.compile(r"([+-])(\d\d):(\d\d)")
+
+
+class OfficeFormatError(Exception):
+    pass
+
+
+def parse_w3cdtf(value):
+    # Same rules as python-docx: offsets are folded into UTC, unparseable values are dropped.
+    parsed = None
+    for date_format in _W3CDTF_FORMATS:
+        try:
+            parsed = datetime.strptime(value[:19], date_format)
+        except ValueError:
+            continue
+    if parsed is None:
+        return None
+    
+    offset = value[19:]
+    if len(offset) == 6:
+        match = _W3CDTF_OFFSET.match(offset)
+        if match is None:
+            return None
+        sign, hours, minutes = match.groups()
+        delta = timedelta(hours=int(hours), minutes=int(minutes))
+        parsed = parsed - delta if sign == "+" else parsed + delta
+    return parsed.replace(tzinfo=timezone.utc)
+
+
+def _read_xml(archive, name):
+    with archive.open(name) as member:
+        return ElementTree.parse(member).getroot()
+
+
+def _package_parts(archive):
+    names = set(archive.namelist())
+    parts = {"main": None, "core": None}
+    if "_rels/.rels" in names:
+        for rel in _read_xml(archive, "_rels/.rels").iter(f"{RELS_NS}Relationship"):
+            rel_type = rel.get("Type", "")
+            target = posixpath.normpath(rel.get("Target", "").lstrip("/"))
+            if rel_type.endswith(OFFICE_DOCUMENT_REL) and parts["main"] is None:
+                parts["main"] = target
+            elif rel_type.endswith(CORE_PROPERTIES_REL) and parts["core"] is None:
+                parts["core"] = target
+    if parts["main"] not in names:
+        raise OfficeFormatError("main document part not found")
+    if parts["core"] not in names:
+        parts["core"] = None
+    return parts
+
+
+def read_core_properties(archive, part_name):
+    properties = {"author": "", "title": "", "subject": "", "last_modified_by": "", "created": None, "modified": None}
+    if part_name is None:
+        return properties
+    
+    root = _read_xml(archive, part_name)
+    for key, tag in (("author", "dc:creator"), ("title", "dc:title"), ("subject", "dc:subject"),
+                     ("last_modified_by", "cp:lastModifiedBy")):
+        element = root.find(tag, CORE_NS)
+        if element is not None and element.text:
+            properties[key] = element.text
+    for key, tag in (("created", "dcterms:created"), ("modified", "dcterms:modified")):
+        element = root.find(tag, CORE_NS)
+        if element is not None and element.text:
+            properties[key] = parse_w3cdtf(element.text.strip())
+    return properties
+
+
+def count_body_paragraphs(archive, part_name):
+    count = 0
+    depth = 0
+    body_depth = None
+    with archive.open(part_name) as member:
+        for event, element in ElementTree.iterparse(member, events=("start", "end")):
+            if event == "start":
+                depth += 1
+                if body_depth is None and element.tag == f"{WORD_NS}body":
+                    body_depth = depth
+                elif body_depth is not None and depth == body_depth + 1 and element.tag == f"{WORD_NS}p":
+                    count += 1
+            else:
+                depth -= 1
+                if body_depth is not None and depth == body_depth:
+                    element.clear()
+    return count
+
+
+def read_sheet_names(archive, part_name):
+    sheets = _read_xml(archive, part_name).find(f"{SHEET_NS}sheets")
+    if sheets is None:
+        return []
+    return [sheet.get("name") for sheet in sheets.iter(f"{SHEET_NS}sheet")]
+
+
+def count_slides(archive, part_name):
+    slide_list = _read_xml(archive, part_name).find(f"{PRESENTATION_NS}sldIdLst")
+    if slide_list is None:
+        return 0
+    return len(slide_list.findall(f"{PRESENTATION_NS}sldId"))
+
+
+def read_office_info(file_path, extension):
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            parts = _package_parts(archive)
+            info = {}
+            
+            if extension == ".docx":
+                core = read_core_properties(archive, parts["core"])
+                info["word_paragraphs"] = count_body_paragraphs(archive, parts["main"])
+                info["word_author"] = core["author"]
+                info["word_title"] = core["title"]
+                info["word_subject"] = core["subject"]
+                info["word_created"] = str(core["created"]) if core["created"] else ""
+                info["word_modified"] = str(core["modified"]) if core["modified"] else ""
+                info["word_last_modified_by"] = core["last_modified_by"]
+            
+            elif extension == ".xlsx":
+                sheet_names = read_sheet_names(archive, parts["main"])
+                info["excel_sheets"] = len(sheet_names)
+                info["excel_sheet_names"] = sheet_names
+            
+            elif extension == ".pptx":
+                info["pptx_slides"] = count_slides(archive, parts["main"])
+    except (OSError, zipfile.BadZipFile, ElementTree.ParseError, OfficeFormatError, KeyError, ValueError):
+        return None
+    
+    return info
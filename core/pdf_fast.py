@@ -0,0 +1,480 @@
+import re
+import zlib
+from collections import namedtuple
+
+
+PdfRef = namedtuple("PdfRef", ["num", "gen"])
+
+WHITESPACE = b"\x00\t\n\x0c\r "
+DELIMITERS = b"()<>[]{}/%"
+TAIL_SIZE = 4096
+OBJECT_CHUNK = 8192
+MAX_OBJECT_SIZE = 4 * 1024 * 1024
+MAX_XREF_SECTIONS = 64
+
+_NUMBER = re.compile(rb"[+-]?(\d+\.?\d*|\.\d+)")
+_ESCAPES = {ord("n"): b"\n", ord("r"): b"\r", ord("t"): b"\t", ord("b"): b"\b", ord("f"): b"\f"}
+
+
+class PdfSyntaxError(Exception):
+    pass
+
+
+class _Incomplete(PdfSyntaxError):
+    pass
+
+
+def _skip_whitespace(data, pos):
+    length = len(data)
+    while pos < length:
+        c = data[pos]
+        if c in WHITESPACE:
+            pos += 1
+        elif c == 0x25:
+            while pos < length and data[pos] not in b"\r\n":
+                pos += 1
+        else:
+            break
+    return pos
+
+
+def _read_token(data, pos):
+    end = pos
+    length = len(data)
+    while end < length and data[end] not in WHITESPACE and data[end] not in DELIMITERS:
+        end += 1
+    if end == length:
+        raise _Incomplete("token runs past end of buffer")
+    return data[pos:end], end
+
+
+def _parse_name(data, pos):
+    token, end = _read_token(data, pos + 1)
+    if b"#" in token:
+        token = re.sub(rb"#([0-9A-Fa-f]{2})", lambda m: bytes([int(m.group(1), 16)]), token)
+    return "/" + token.decode("latin-1"), end
+
+
+def _parse_literal_string(data, pos):
+    out = bytearray()
+    depth = 1
+    pos += 1
+    length = len(data)
+    
+    while pos < length:
+        c = data[pos]
+        if c == 0x5C:
+            pos += 1
+            if pos >= length:
+                break
+            c = data[pos]
+            if c in _ESCAPES:
+                out += _ESCAPES[c]
+            elif 0x30 <= c <= 0x37:
+                digits = data[pos:pos + 3]
+                count = 1
+                while count < len(digits) and 0x30 <= digits[count] <= 0x37:
+                    count += 1
+                out.append(int(digits[:count], 8) & 0xFF)
+                pos += count - 1
+            elif c == 0x0D:
+                if data[pos + 1:pos + 2] == b"\n":
+                    pos += 1
+            elif c != 0x0A:
+                out.append(c)
+        elif c == 0x28:
+            depth += 1
+            out.append(c)
+        elif c == 0x29:
+            depth -= 1
+            if depth == 0:
+                return bytes(out), pos + 1
+            out.append(c)
+        else:
+            out.append(c)
+        pos += 1
+    
+    raise _Incomplete("unterminated string")
+
+
+def _parse_hex_string(data, pos):
+    end = data.find(b">", pos)
+    if end < 0:
+        raise _Incomplete("unterminated hex string")
+    digits = bytes(c for c in data[pos + 1:end] if c not in WHITESPACE)
+    if len(digits) % 2:
+        digits += b"0"
+    return bytes.fromhex(digits.decode("ascii")), end + 1
+
+
+def _parse_number(token):
+    if not _NUMBER.fullmatch(token):
+        raise PdfSyntaxError(f"unexpected token {token[:20]!r}")
+    if b"." in token:
+        return float(token)
+    return int(token)
+
+
+def parse_object(data, pos):
+    pos = _skip_whitespace(data, pos)
+    if pos >= len(data):
+        raise _Incomplete("unexpected end of buffer")
+    
+    c = data[pos]
+    if data.startswith(b"<<", pos):
+        result = {}
+        pos += 2
+        while True:
+            pos = _skip_whitespace(data, pos)
+            if data.startswith(b">>", pos):
+                return result, pos + 2
+            if pos >= len(data):
+                raise _Incomplete("unterminated dictionary")
+            key, pos = parse_object(data, pos)
+            if not isinstance(key, str) or not key.startswith("/"):
+                raise PdfSyntaxError("dictionary key is not a name")
+            value, pos = parse_object(data, pos)
+            result[key] = value
+    if c == 0x3C:
+        return _parse_hex_string(data, pos)
+    if c == 0x28:
+        return _parse_literal_string(data, pos)
+    if c == 0x5B:
+        result = []
+        pos += 1
+        while True:
+            pos = _skip_whitespace(data, pos)
+            if data.startswith(b"]", pos):
+                return result, pos + 1
+            if pos >= len(data):
+                raise _Incomplete("unterminated array")
+            value, pos = parse_object(data, pos)
+            result.append(value)
+    if c == 0x2F:
+        return _parse_name(data, pos)
+    
+    token, end = _read_token(data, pos)
+    if token == b"true":
+        return True, end
+    if token == b"false":
+        return False, end
+    if token == b"null":
+        return None, end
+    
+    value = _parse_number(token)
+    if isinstance(value, int) and value >= 0:
+        # "num gen R" is an indirect reference; anything else leaves the number alone.
+        next_pos = _skip_whitespace(data, end)
+        match = re.match(rb"(\d+)[\x00\t\n\x0c\r ]+R(?=[\x00\t\n\x0c\r ()<>\[\]{}/%]|$)", data[next_pos:next_pos + 32])
+        if match:
+            return PdfRef(value, int(match.group(1))), next_pos + match.end()
+    return value, end
+
+
+def decode_text(value):
+    if isinstance(value, bytes):
+        if value.startswith(b"\xfe\xff"):
+            return value[2:].decode("utf-16-be", "replace")
+        if value.startswith(b"\xff\xfe"):
+            return value[2:].decode("utf-16-le", "replace")
+        if value.startswith(b"\xef\xbb\xbf"):
+            return value[3:].decode("utf-8", "replace")
+        return value.decode("latin-1")
+    if value is None:
+        return ""
+    return str(value)
+
+
+def _png_unpredict(data, columns):
+    row_length = columns + 1
+    if len(data) % row_length:
+        raise PdfSyntaxError("predictor rows do not divide the stream")
+    
+    previous = bytearray(columns)
+    out = bytearray()
+    for start in range(0, len(data), row_length):
+        filter_type = data[start]
+        row = bytearray(data[start + 1:start + row_length])
+        for i in range(columns):
+            left = row[i - 1] if i else 0
+            up = previous[i]
+            if filter_type == 1:
+                row[i] = (row[i] + left) & 0xFF
+            elif filter_type == 2:
+                row[i] = (row[i] + up) & 0xFF
+            elif filter_type == 3:
+                row[i] = (row[i] + ((left + up) >> 1)) & 0xFF
+            elif filter_type == 4:
+                upper_left = previous[i - 1] if i else 0
+                estimate = left + up - upper_left
+                pa, pb, pc = abs(estimate - left), abs(estimate - up), abs(estimate - upper_left)
+                row[i] = (row[i] + (left if pa <= pb and pa <= pc else up if pb <= pc else upper_left)) & 0xFF
+            elif filter_type != 0:
+                raise PdfSyntaxError(f"unsupported PNG predictor {filter_type}")
+        out += row
+        previous = row
+    return bytes(out)
+
+
+def _decode_stream(stream_dict, raw):
+    filters = stream_dict.get("/Filter")
+    params = stream_dict.get("/DecodeParms") or {}
+    if isinstance(filters, str):
+        filters = [filters]
+        params = [params]
+    filters = filters or []
+    if not isinstance(params, list):
+        params = [params]
+    
+    data = raw
+    for index, name in enumerate(filters):
+        if name not in ("/FlateDecode", "/Fl"):
+            raise PdfSyntaxError(f"unsupported filter {name}")
+        data = zlib.decompress(data)
+        param = params[index] if index < len(params) and isinstance(params[index], dict) else {}
+        predictor = param.get("/Predictor", 1)
+        if predictor >= 10:
+            data = _png_unpredict(data, param.get("/Columns", 1) * param.get("/Colors", 1) * param.get("/BitsPerComponent", 8) // 8)
+        elif predictor != 1:
+            raise PdfSyntaxError(f"unsupported predictor {predictor}")
+    return data
+
+
+def _read_at(f, offset, size):
+    f.seek(offset)
+    return f.read(size)
+
+
+def _parse_at(f, offset, parse):
+    size = OBJECT_CHUNK
+    while True:
+        data = _read_at(f, offset, size)
+        try:
+            return parse(data)
+        except _Incomplete:
+            if len(data) < size or size >= MAX_OBJECT_SIZE:
+                raise PdfSyntaxError(f"object at {offset} is truncated")
+            size *= 4
+
+
+def _parse_indirect_header(data):
+    match = re.match(rb"[\x00\t\n\x0c\r ]*(\d+)[\x00\t\n\x0c\r ]+(\d+)[\x00\t\n\x0c\r ]+obj", data)
+    if not match:
+        raise PdfSyntaxError("missing 'obj' header")
+    return int(match.group(1)), match.end()
+
+
+class _PdfFile:
+    def __init__(self, f):
+        self.f = f
+        self.offsets = {}
+        self.compressed = {}
+        self.free = set()
+        self.object_streams = {}
+        self.trailer = {}
+    
+    def _stream_data(self, stream_dict, data_start):
+        length = stream_dict.get("/Length")
+        if isinstance(length, PdfRef):
+            length = self.resolve(length)
+        if not isinstance(length, int) or length < 0 or length > MAX_OBJECT_SIZE * 16:
+            raise PdfSyntaxError("bad stream length")
+        return _decode_stream(stream_dict, _read_at(self.f, data_start, length))
+    
+    def read_indirect(self, offset, expected_num=None, with_stream=False):
+        header_end = [0]
+        
+        def parse(data):
+            num, pos = _parse_indirect_header(data)
+            if expected_num is not None and num != expected_num:
+                raise PdfSyntaxError(f"expected object {expected_num}, found {num}")
+            value, pos = parse_object(data, pos)
+            header_end[0] = pos
+            stream_data_start = None
+            if with_stream and isinstance(value, dict):
+                match = re.match(rb"[\x00\t\n\x0c\r ]*stream(\r\n|\n|\r)", data[pos:pos + 32])
+                if match:
+                    stream_data_start = pos + match.end()
+            return value, stream_data_start
+        
+        value, stream_data_start = _parse_at(self.f, offset, parse)
+        if with_stream:
+            if stream_data_start is None:
+                raise PdfSyntaxError("expected a stream object")
+            return value, self._stream_data(value, offset + stream_data_start)
+        return value
+    
+    def _object_from_stream(self, stream_num, index):
+        if stream_num not in self.object_streams:
+            offset = self.offsets.get(stream_num)
+            if offset is None:
+                raise PdfSyntaxError(f"object stream {stream_num} not in xref")
+            stream_dict, data = self.read_indirect(offset, stream_num, with_stream=True)
+            count = stream_dict.get("/N", 0)
+            first = stream_dict.get("/First", 0)
+            header = data[:first].split()
+            entries = [(int(header[i]), int(header[i + 1])) for i in range(0, min(len(header), count * 2), 2)]
+            self.object_streams[stream_num] = (entries, data[first:])
+        
+        entries, body = self.object_streams[stream_num]
+        if index >= len(entries):
+            raise PdfSyntaxError("object stream index out of range")
+        value, _ = parse_object(body, entries[index][1])
+        return value
+    
+    def resolve(self, value, depth=0):
+        while isinstance(value, PdfRef):
+            if depth > 32:
+                raise PdfSyntaxError("reference chain too deep")
+            depth += 1
+            if value.num in self.compressed:
+                value = self._object_from_stream(*self.compressed[value.num])
+            elif value.num in self.offsets:
+                value = self.read_indirect(self.offsets[value.num], value.num)
+            else:
+                return None
+        return value
+    
+    def _merge_trailer(self, trailer):
+        for key, value in trailer.items():
+            self.trailer.setdefault(key, value)
+    
+    def _read_xref_table(self, offset):
+        def parse(data):
+            if not data.startswith(b"xref"):
+                raise PdfSyntaxError("not an xref table")
+            trailer_pos = data.find(b"trailer")
+            if trailer_pos < 0:
+                raise _Incomplete("trailer not found")
+            trailer, _ = parse_object(data, trailer_pos + len(b"trailer"))
+            return data[4:trailer_pos].split(), trailer
+        
+        tokens, trailer = _parse_at(self.f, offset, parse)
+        free = set()
+        pos = 0
+        while pos + 1 < len(tokens):
+            start, count = int(tokens[pos]), int(tokens[pos + 1])
+            pos += 2
+            for num in range(start, start + count):
+                if pos + 3 > len(tokens):
+                    raise PdfSyntaxError("truncated xref table")
+                entry_offset, kind = int(tokens[pos]), tokens[pos + 2]
+                pos += 3
+                if self._known(num) or num in free:
+                    continue
+                if kind == b"n":
+                    self.offsets[num] = entry_offset
+                else:
+                    free.add(num)
+        return trailer, free
+    
+    def _known(self, num):
+        return num in self.offsets or num in self.compressed or num in self.free
+    
+    def _read_xref_stream(self, offset):
+        stream_dict, data = self.read_indirect(offset, with_stream=True)
+        if stream_dict.get("/Type") != "/XRef":
+            raise PdfSyntaxError("not an xref stream")
+        
+        widths = stream_dict.get("/W", [])
+        if len(widths) != 3:
+            raise PdfSyntaxError("bad /W in xref stream")
+        index = stream_dict.get("/Index") or [0, stream_dict.get("/Size", 0)]
+        entry_size = sum(widths)
+        
+        def field(entry, start, width, default):
+            if width == 0:
+                return default
+            return int.from_bytes(entry[start:start + width], "big")
+        
+        pos = 0
+        for i in range(0, len(index) - 1, 2):
+            start, count = index[i], index[i + 1]
+            for num in range(start, start + count):
+                entry = data[pos:pos + entry_size]
+                pos += entry_size
+                if len(entry) < entry_size:
+                    raise PdfSyntaxError("truncated xref stream")
+                kind = field(entry, 0, widths[0], 1)
+                second = field(entry, widths[0], widths[1], 0)
+                third = field(entry, widths[0] + widths[1], widths[2], 0)
+                if self._known(num):
+                    continue
+                if kind == 1:
+                    self.offsets[num] = second
+                elif kind == 2:
+                    self.compressed[num] = (second, third)
+                else:
+                    self.free.add(num)
+        return stream_dict
+    
+    def load_xref(self, startxref):
+        seen = set()
+        offset = startxref
+        while offset is not None and offset not in seen and len(seen) < MAX_XREF_SECTIONS:
+            seen.add(offset)
+            if _read_at(self.f, offset, 4) == b"xref":
+                trailer, free = self._read_xref_table(offset)
+                # Hybrid files list compressed objects as free in the table and give their real
+                # location in /XRefStm, so the table's free entries only count after the stream.
+                if isinstance(trailer.get("/XRefStm"), int):
+                    self._read_xref_stream(trailer["/XRefStm"])
+                self.free.update(num for num in free if num not in self.offsets and num not in self.compressed)
+            else:
+                trailer = self._read_xref_stream(offset)
+            self._merge_trailer(trailer)
+            offset = trailer.get("/Prev")
+
+
+def _find_startxref(f):
+    f.seek(0, 2)
+    size = f.tell()
+    tail = _read_at(f, max(0, size - TAIL_SIZE), TAIL_SIZE)
+    pos = tail.rfind(b"startxref")
+    if pos < 0:
+        raise PdfSyntaxError("startxref not found")
+    match = re.match(rb"startxref[\x00\t\n\x0c\r ]+(\d+)", tail[pos:])
+    if not match:
+        raise PdfSyntaxError("bad startxref")
+    return int(match.group(1))
+
+
+def read_pdf_info(file_path):
+    try:
+        with open(file_path, "rb") as f:
+            if not _read_at(f, 0, 1024).lstrip(WHITESPACE).startswith(b"%PDF"):
+                return None
+            
+            pdf = _PdfFile(f)
+            pdf.load_xref(_find_startxref(f))
+            
+            if "/Encrypt" in pdf.trailer:
+                return None
+            
+            catalog = pdf.resolve(pdf.trailer.get("/Root"))
+            if not isinstance(catalog, dict):
+                return None
+            pages = pdf.resolve(catalog.get("/Pages"))
+            if not isinstance(pages, dict):
+                return None
+            count = pdf.resolve(pages.get("/Count"))
+            if not isinstance(count, int):
+                return None
+            
+            # A reference that does not resolve means the xref was not fully understood; PyPDF2's
+            # recovery gets the metadata right more often than an empty result would.
+            info = {}
+            if "/Info" in pdf.trailer:
+                info = pdf.resolve(pdf.trailer["/Info"])
+                if not isinstance(info, dict):
+                    return None
+            metadata = {}
+            for key, value in info.items():
+                resolved = pdf.resolve(value)
+                if resolved is None and isinstance(value, PdfRef):
+                    return None
+                metadata[key] = decode_text(resolved)
+    except (OSError, PdfSyntaxError, ValueError, zlib.error, IndexError, KeyError, TypeError):
+        return None
+    
+    return {"pages": count, "metadata": metadata}
@@ -0,0 +1,361 @@
+import heapq
+import os
+import tempfile
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+
+
+PDF_FILES_PER_SECTION = 500
+PDF_CORRELATIONS_PER_SECTION = 2000
+PDF_TOP_ANOMALIES = 100
+PDF_TOP_CORRELATIONS = 50
+SEVERITY_RANK = {"high": 0, "medium": 1, "low": 2}
+
+
+def _pdf_styles():
+    styles = getSampleStyleSheet()
+    return {
+        "title": ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=24,
+            textColor=colors.HexColor('#1f77b4'),
+            spaceAfter=30,
+            alignment=1
+        ),
+        "heading": ParagraphStyle(
+            'CustomHeading',
+            parent=styles['Heading2'],
+            fontSize=14,
+            textColor=colors.HexColor('#2ca02c'),
+            spaceAfter=12,
+            spaceBefore=12
+        ),
+        "subheading": styles['Heading3'],
+        "normal": styles['Normal']
+    }
+
+
+def _info_table_style(background, font_size, padding, grid_color):
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor(background)),
+        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), font_size),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), padding),
+        ('GRID', (0, 0), (-1, -1), 1, grid_color)
+    ])
+
+
+def _header_table_style():
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e6f2ff')),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('GRID', (0, 0), (-1, -1), 1, colors.lightgrey)
+    ])
+
+
+def _cover_flowables(cover, styles):
+    case_table = Table([
+        ["Case ID:", cover["case_id"]],
+        ["Case Name:", cover["case_name"]],
+        ["Generated:", cover["generated"]],
+        ["Total Files:", str(cover["total_files"])],
+        ["Correlations Found:", str(cover["correlation_count"])]
+    ], colWidths=[2*inch, 4.5*inch])
+    case_table.setStyle(_info_table_style('#e6f2ff', 10, 12, colors.grey))
+    return [Paragraph("MetaTrace Digital Evidence Report", styles["title"]), Spacer(1, 0.3*inch),
+            case_table, Spacer(1, 0.3*inch)]
+
+
+def _file_flowables(records, first_index, styles):
+    # One shared style object instead of a fresh TableStyle per file.
+    table_style = _info_table_style('#fff0f0', 9, 10, colors.lightgrey)
+    story = []
+    for idx, file_data in enumerate(records, first_index):
+        metadata = file_data.get("metadata", {})
+        hashes = file_data.get("hashes", {})
+        anomalies = file_data.get("anomalies", [])
+        
+        file_table = Table([
+            ["File Name:", metadata.get("file_name", "")],
+            ["File Size:", str(metadata.get("file_size", "")) + " bytes"],
+            ["MD5:", hashes.get("md5", "")[:32] + "..."],
+            ["SHA256:", hashes.get("sha256", "")[:32] + "..."],
+        ], colWidths=[2*inch, 4.5*inch])
+        file_table.setStyle(table_style)
+        
+        story.append(Paragraph(f"File {idx}: {escape(str(metadata.get('file_name', '')))}", styles["subheading"]))
+        story.append(file_table)
+        
+        if anomalies:
+            story.append(Paragraph(f"⚠️ Anomalies Detected ({len(anomalies)})", styles["normal"]))
+            for anomaly in anomalies:
+                story.append(Paragraph(f"• {escape(str(anomaly.get('message', '')))}", styles["normal"]))
+        
+        story.append(Spacer(1, 0.2*inch))
+    return story
+
+
+def _correlation_flowables(correlations, styles):
+    story = []
+    for corr in correlations:
+        corr_text = (f"<b>{escape(str(corr.get('matched_field', corr['type'])))}</b>: {escape(str(corr['matched_value'])[:60])}"
+                     f"<br/>Confidence: {corr['confidence']}%<br/>{escape(str(corr['explanation']))}")
+        story.append(Paragraph(corr_text, styles["normal"]))
+        story.append(Spacer(1, 0.1*inch))
+    return story
+
+
+def _summary_flowables(summary, styles):
+    story = [Paragraph("Anomaly Overview", styles["heading"])]
+    
+    overview = [["Severity", "Anomalies"]] + [[severity, str(count)] for severity, count in summary["by_severity"]]
+    overview.append(["Files with anomalies", str(summary["files_with_anomalies"])])
+    table = Table(overview, colWidths=[3*inch, 3.5*inch])
+    table.setStyle(_header_table_style())
+    story += [table, Spacer(1, 0.2*inch)]
+    
+    if summary["by_type"]:
+        by_type = Table([["Anomaly Type", "Count"]] + [[anomaly_type, str(count)] for anomaly_type, count in summary["by_type"]],
+                        colWidths=[3*inch, 3.5*inch])
+        by_type.setStyle(_header_table_style())
+        story += [by_type, Spacer(1, 0.2*inch)]
+    
+    if summary["top_anomalies"]:
+        story.append(Paragraph(f"Top {len(summary['top_anomalies'])} Anomalies", styles["heading"]))
+        rows = [["#", "File", "Severity", "Message"]]
+        for idx, file_name, severity, message in summary["top_anomalies"]:
+            rows.append([str(idx), Paragraph(escape(str(file_name)), styles["normal"]), severity.upper(),
+                         Paragraph(escape(str(message)), styles["normal"])])
+        table = Table(rows, colWidths=[0.6*inch, 2*inch, 0.9*inch, 3*inch], repeatRows=1)
+        table.setStyle(_header_table_style())
+        story += [table, Spacer(1, 0.2*inch)]
+    
+    if summary["top_correlations"]:
+        story.append(Paragraph(f"Top {len(summary['top_correlations'])} Correlations", styles["heading"]))
+        story += _correlation_flowables(summary["top_correlations"], styles)
+    return story
+
+
+def render_pdf_section(section, output_path):
+    styles = _pdf_styles()
+    story = []
+    if section.get("cover"):
+        story += _cover_flowables(section["cover"], styles)
+    if section.get("heading"):
+        story.append(Paragraph(section["heading"], styles["heading"]))
+    
+    if section["kind"] == "files":
+        story += _file_flowables(section["records"], section["first"], styles)
+    elif section["kind"] == "correlations":
+        story += _correlation_flowables(section["records"], styles)
+    elif section["kind"] == "summary":
+        story += _summary_flowables(section["summary"], styles)
+    
+    SimpleDocTemplate(str(output_path), pagesize=letter).build(story)
+    return output_path
+
+
+def _cover(case_data):
+    return {
+        "case_id": case_data.get("case_id", ""),
+        "case_name": case_data.get("case_name", ""),
+        "generated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "total_files": case_data.get("total_files", 0),
+        "correlation_count": case_data.get("correlation_count", 0)
+    }
+
+
+def _batches(records, size):
+    # Slicing lazily keeps case-store records on disk until their section is rendered.
+    for start in range(0, len(records), size):
+        yield start, records[start:start + size]
+
+
+def report_sections(case_data, files_per_section=PDF_FILES_PER_SECTION, correlations_per_section=PDF_CORRELATIONS_PER_SECTION):
+    files_data = case_data.get("files", [])
+    correlations = case_data.get("correlations", [])
+    
+    file_sections = -(-len(files_data) // files_per_section)
+    correlation_sections = -(-len(correlations) // correlations_per_section)
+    
+    def generate():
+        if not files_data:
+            yield {"kind": "files", "label": "Case summary", "cover": _cover(case_data), "heading": "File Summary",
+                   "records": [], "first": 1}
+        for start, records in _batches(files_data, files_per_section):
+            section = {"kind": "files", "label": f"Files {start + 1}-{start + len(records)}", "records": records, "first": start + 1}
+            if not start:
+                section.update(cover=_cover(case_data), heading="File Summary")
+            yield section
+        for start, records in _batches(correlations, correlations_per_section):
+            section = {"kind": "correlations", "label": f"Correlations {start + 1}-{start + len(records)}", "records": records}
+            if not start:
+                section["heading"] = "Correlation Analysis"
+            yield section
+    
+    return max(file_sections, 1) + correlation_sections, generate()
+
+
+def anomaly_summary(case_data, top_anomalies=PDF_TOP_ANOMALIES, top_correlations=PDF_TOP_CORRELATIONS):
+    by_severity = Counter()
+    by_type = Counter()
+    files_with_anomalies = 0
+    
+    def ranked():
+        nonlocal files_with_anomalies
+        for idx, file_data in enumerate(case_data.get("files", []), 1):
+            anomalies = file_data.get("anomalies", [])
+            if anomalies:
+                files_with_anomalies += 1
+            file_name = file_data.get("metadata", {}).get("file_name", "")
+            for position, anomaly in enumerate(anomalies):
+                severity = (anomaly.get("severity") or "medium").lower()
+                by_severity[severity] += 1
+                by_type[anomaly.get("type", "unknown")] += 1
+                yield (SEVERITY_RANK.get(severity, len(SEVERITY_RANK)), idx, position), (idx, file_name, severity, anomaly.get("message", ""))
+    
+    # A bounded heap keeps only the top N in memory however many anomalies the case has.
+    top = [entry for _, entry in heapq.nsmallest(top_anomalies, ranked(), key=lambda item: item[0])]
+    return {
+        "by_severity": sorted(by_severity.items(), key=lambda item: (SEVERITY_RANK.get(item[0], len(SEVERITY_RANK)), item[0])),
+        "by_type": by_type.most_common(),
+        "files_with_anomalies": files_with_anomalies,
+        "top_anomalies": top,
+        "top_correlations": heapq.nlargest(top_correlations, case_data.get("correlations", []), key=lambda corr: corr.get("confidence", 0))
+    }
+
+
+def _merge_parts(part_paths, output_path):
+    from PyPDF2 import PdfReader
+    from PyPDF2.generic import ArrayObject, DictionaryObject, IndirectObject, NameObject
+    
+    # PdfWriter keeps every page of every part until it writes; here objects are copied to the
+    # output as soon as they are reached, so only one part is ever held in memory.
+    # Object 1 is the catalog and object 2 the single page tree, both written last.
+    offsets = [None, None, None]
+    kids = []
+    info = None
+    
+    with open(output_path, "wb") as out:
+        out.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        
+        for part_path in part_paths:
+            reader = PdfReader(str(part_path))
+            numbers = {}
+            queue = deque()
+            
+            def renumber(reference):
+                number = numbers.get(reference.idnum)
+                if number is None:
+                    number = numbers[reference.idnum] = len(offsets)
+                    offsets.append(None)
+                    queue.append((number, reference.get_object()))
+                return IndirectObject(number, 0, None)
+            
+            def remap(value):
+                if isinstance(value, IndirectObject):
+                    return value if value.pdf is None else renumber(value)
+                if isinstance(value, DictionaryObject):
+                    if value.get("/Type") == "/Page":
+                        dict.__setitem__(value, NameObject("/Parent"), IndirectObject(2, 0, None))
+                    for key, item in list(dict.items(value)):
+                        dict.__setitem__(value, key, remap(item))
+                elif isinstance(value, ArrayObject):
+                    for position, item in enumerate(value):
+                        list.__setitem__(value, position, remap(item))
+                return value
+            
+            # The document information (title, producer, dates) comes from the first part.
+            info_reference = reader.trailer.raw_get("/Info") if "/Info" in reader.trailer else None
+            if info is None and isinstance(info_reference, IndirectObject):
+                info = renumber(info_reference).idnum
+            
+            for page in reader.pages:
+                kids.append(renumber(page.indirect_reference).idnum)
+                while queue:
+                    number, value = queue.popleft()
+                    remap(value)
+                    offsets[number] = out.tell()
+                    out.write(f"{number} 0 obj\n".encode())
+                    value.write_to_stream(out, None)
+                    out.write(b"\nendobj\n")
+        
+        offsets[1] = out.tell()
+        out.write(b"1 0 obj\n<< /Type /Catalog /Pages 2 0 R >>\nendobj\n")
+        offsets[2] = out.tell()
+        out.write(b"2 0 obj\n<< /Type /Pages /Count %d /Kids [" % len(kids))
+        for number in kids:
+            out.write(b"%d 0 R " % number)
+        out.write(b"] >>\nendobj\n")
+        
+        xref = out.tell()
+        out.write(b"xref\n0 %d\n0000000000 65535 f \n" % len(offsets))
+        for offset in offsets[1:]:
+            out.write(b"%010d 00000 n \n" % offset)
+        info_entry = b" /Info %d 0 R" % info if info is not None else b""
+        out.write(b"trailer\n<< /Size %d /Root 1 0 R%s >>\nstartxref\n%d\n%%%%EOF\n" % (len(offsets), info_entry, xref))
+
+
+def _render_sections(sections, total, part_dir, workers, progress):
+    part_paths = []
+    
+    def finished(label):
+        if progress is not None:
+            progress(len(part_paths), total, label)
+    
+    if workers <= 1:
+        for position, section in enumerate(sections):
+            part_paths.append(render_pdf_section(section, Path(part_dir) / f"part_{position:05d}.pdf"))
+            finished(section["label"])
+        return part_paths
+    
+    # At most two sections per worker are queued, so batch records are never all pickled up front.
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for position, section in enumerate(sections):
+            pending.append((section["label"], pool.submit(render_pdf_section, section, Path(part_dir) / f"part_{position:05d}.pdf")))
+            if len(pending) >= workers * 2:
+                label, future = pending.popleft()
+                part_paths.append(future.result())
+                finished(label)
+        while pending:
+            label, future = pending.popleft()
+            part_paths.append(future.result())
+            finished(label)
+    return part_paths
+
+
+def write_pdf_report(case_data, output_path, summary_only=False, workers=1, progress=None):
+    if summary_only:
+        section = {"kind": "summary", "label": "Summary", "cover": _cover(case_data), "summary": anomaly_summary(case_data)}
+        render_pdf_section(section, output_path)
+        if progress is not None:
+            progress(1, 1, section["label"])
+        return 1
+    
+    total, sections = report_sections(case_data)
+    if total == 1:
+        section = next(sections)
+        render_pdf_section(section, output_path)
+        if progress is not None:
+            progress(1, 1, section["label"])
+        return 1
+    
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(output_path))) as part_dir:
+        part_paths = _render_sections(sections, total, part_dir, max(1, min(workers, total)), progress)
+        _merge_parts(part_paths, output_path)
+    return total
@@ -0,0 +1,207 @@
+import os
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor
+
+from core.extracter import parse_file, build_result
+from core.hash_utils import calculate_hashes_and_fingerprints
+from core.extraction_cache import (
+    CACHE_COMMIT_INTERVAL,
+    file_identity,
+    normalize_result,
+    lookup_cached_extraction,
+    store_cached_extraction,
+    discard_cached_extraction,
+    evict_extraction_cache
+)
+
+
+DEFAULT_WORKERS = os.cpu_count() or 1
+SESSION_CACHE_MAX_ENTRIES = 20000
+
+_session_cache = OrderedDict()
+
+
+class _InlineExecutor:
+    def __init__(self, max_workers=None):
+        pass
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        return False
+    
+    def submit(self, fn, *args):
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+def session_cache_key(file_path, stat=None):
+    if stat is None:
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+    return (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+
+
+def get_cached_result(cache_key, file_path):
+    cached = _session_cache.get(cache_key) if cache_key is not None else None
+    if cached is None:
+        return None
+    _session_cache.move_to_end(cache_key)
+    return dict(cached, file_path=file_path)
+
+
+def store_cached_result(cache_key, result):
+    if cache_key is not None:
+        _session_cache[cache_key] = result
+        _session_cache.move_to_end(cache_key)
+        # Least recently used results go first; the persistent cache still has them.
+        while len(_session_cache) > SESSION_CACHE_MAX_ENTRIES:
+            _session_cache.popitem(last=False)
+
+
+def clear_session_cache():
+    _session_cache.clear()
+
+
+def store_completed_result(file_entry, stat, persistent_cache=None):
+    from datetime import datetime
+    
+    # Only the hashes are new; the rest is cacheable only while it still describes the file on disk.
+    metadata = file_entry.get("metadata", {})
+    if metadata.get("file_size") != stat.st_size or \
+            metadata.get("modified_time") != datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S"):
+        return False
+    
+    file_path = file_entry["file_path"]
+    result = normalize_result(build_result(file_path, metadata, file_entry["hashes"], file_entry.get("anomalies", []),
+                                           file_entry.get("fingerprints"), file_entry.get("hash_status", "full")))
+    store_cached_result(session_cache_key(file_path, stat), result)
+    if persistent_cache is not None and stat.st_ino:
+        store_cached_extraction(persistent_cache, file_identity(stat), file_path, result)
+    return True
+
+
+def _stat_or_none(file_path):
+    try:
+        return os.stat(file_path)
+    except OSError:
+        return None
+
+
+def iter_extract_files(file_paths, workers=None, use_processes=False, max_pending=None, use_cache=True, persistent_cache=None, verify_cache=False, triage=False):
+    workers = workers or DEFAULT_WORKERS
+    
+    if workers <= 1:
+        parse_executor = hash_executor = _InlineExecutor
+        max_pending = 1
+    else:
+        # Parsing (PyPDF2, openpyxl, Pillow) is CPU-bound and may go to processes;
+        # hashing is I/O-bound and hashlib releases the GIL, so it stays on threads.
+        parse_executor = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        hash_executor = ThreadPoolExecutor
+        max_pending = max_pending or workers * 2
+    
+    pending = deque()
+    stores = 0
+    
+    def collect(entry):
+        nonlocal stores
+        file_path, stat, session_key, identity, cached, parse_future, hash_future = entry
+        
+        if cached is not None and hash_future is None:
+            return cached
+        
+        hash_status = "full"
+        if cached is not None:
+            hashes, content_fingerprints = hash_future.result()
+            if hashes == cached.get("hashes"):
+                store_cached_result(session_key, cached)
+                return cached
+            _session_cache.pop(session_key, None)
+            if persistent_cache is not None and identity is not None:
+                discard_cached_extraction(persistent_cache, identity)
+            metadata, anomalies, fingerprints = parse_file(file_path, stat)
+            fingerprints = {**fingerprints, **content_fingerprints}
+        else:
+            metadata, anomalies, fingerprints = parse_future.result()
+            if hash_future is None:
+                hashes, hash_status = {}, "deferred"
+            else:
+                hashes, content_fingerprints = hash_future.result()
+                fingerprints = {**fingerprints, **content_fingerprints}
+        
+        result = normalize_result(build_result(file_path, metadata, hashes, anomalies, fingerprints, hash_status))
+        # Deferred results are never cached, so a later full run cannot pick up empty hashes.
+        if hash_status != "full":
+            return result
+        store_cached_result(session_key, result)
+        
+        if persistent_cache is not None and identity is not None:
+            store_cached_extraction(persistent_cache, identity, file_path, result)
+            stores += 1
+            if stores % CACHE_COMMIT_INTERVAL == 0:
+                persistent_cache.commit()
+        
+        return result
+    
+    with parse_executor(max_workers=workers) as parse_pool, hash_executor(max_workers=workers) as hash_pool:
+        try:
+            for item in file_paths:
+                # Walkers may hand over (path, stat) pairs so the file is not stat'ed twice.
+                file_path, stat = item if isinstance(item, tuple) else (item, None)
+                if stat is not None and not stat.st_ino:
+                    stat = None
+                if stat is None and (use_cache or persistent_cache is not None):
+                    stat = _stat_or_none(file_path)
+                session_key = session_cache_key(file_path, stat) if use_cache and stat is not None else None
+                identity = file_identity(stat) if persistent_cache is not None and stat is not None and stat.st_ino else None
+                
+                cached = get_cached_result(session_key, file_path)
+                if cached is None and identity is not None:
+                    cached = lookup_cached_extraction(persistent_cache, identity)
+                    if cached is not None:
+                        cached["file_path"] = file_path
+                        if not verify_cache:
+                            store_cached_result(session_key, cached)
+                
+                # Verification re-hashes every hit, whichever cache it came from.
+                verify_future = None
+                if cached is not None and verify_cache:
+                    # Same job as a miss, so a mismatch can be rebuilt with its content fingerprints.
+                    verify_future = hash_pool.submit(calculate_hashes_and_fingerprints, file_path)
+                
+                if cached is not None:
+                    pending.append((file_path, stat, session_key, identity, cached, None, verify_future))
+                else:
+                    pending.append((
+                        file_path,
+                        stat,
+                        session_key,
+                        identity,
+                        None,
+                        parse_pool.submit(parse_file, file_path, stat),
+                        None if triage else hash_pool.submit(calculate_hashes_and_fingerprints, file_path)
+                    ))
+                
+                while len(pending) >= max_pending:
+                    yield collect(pending.popleft())
+            
+            while pending:
+                yield collect(pending.popleft())
+        finally:
+            for _, _, _, _, _, parse_future, hash_future in pending:
+                if parse_future is not None:
+                    parse_future.cancel()
+                if hash_future is not None:
+                    hash_future.cancel()
+            
+            if persistent_cache is not None:
+                persistent_cache.commit()
+                evict_extraction_cache(persistent_cache)
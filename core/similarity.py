@@ -0,0 +1,109 @@
+import hashlib
+import zlib
+
+
+SIMILARITY_EXTENSIONS = [".pdf", ".docx", ".xlsx", ".pptx", ".doc", ".xls", ".ppt", ".odt", ".ods", ".odp",
+                         ".rtf", ".txt", ".csv", ".html", ".htm", ".xml", ".json", ".md"]
+MINHASH_PERMUTATIONS = 64
+CHUNK_WINDOW = 16
+CHUNK_MASK = (1 << 8) - 1
+MERSENNE_PRIME = (1 << 31) - 1
+# Past this many bytes the signature is already stable; the rest of the file only feeds the crypto hashes.
+SIMILARITY_MAX_BYTES = 64 * 1024 * 1024
+
+
+def _seeded_words(label, count, modulus):
+    return [int.from_bytes(hashlib.blake2b(f"{label}{i}".encode(), digest_size=8).digest(), "big") % modulus
+            for i in range(count)]
+
+
+class SimilarityDigest:
+    # Content-defined chunks (cut where a windowed sum of per-byte random words hits CHUNK_MASK)
+    # hashed with CRC32, then summarised as a MinHash signature over the set of chunk hashes.
+    _tables = None
+    
+    def __init__(self):
+        import numpy
+        
+        if SimilarityDigest._tables is None:
+            SimilarityDigest._tables = (
+                numpy.array(_seeded_words("gear", 256, 1 << 32), dtype=numpy.uint32),
+                numpy.array(_seeded_words("a", MINHASH_PERMUTATIONS, MERSENNE_PRIME - 1), dtype=numpy.uint64)[:, None] + 1,
+                numpy.array(_seeded_words("b", MINHASH_PERMUTATIONS, MERSENNE_PRIME), dtype=numpy.uint64)[:, None]
+            )
+        self.numpy = numpy
+        self.tail = b""
+        self.chunk_crc = 0
+        self.chunk_pending = False
+        self.chunk_count = 0
+        self.bytes_seen = 0
+        self.signature = numpy.full(MINHASH_PERMUTATIONS, MERSENNE_PRIME, dtype=numpy.uint64)
+    
+    def update(self, data):
+        if self.bytes_seen >= SIMILARITY_MAX_BYTES:
+            return
+        data = data[:SIMILARITY_MAX_BYTES - self.bytes_seen]
+        self.bytes_seen += len(data)
+        numpy = self.numpy
+        gear, _, _ = self._tables
+        
+        window = self.tail + bytes(data)
+        view = memoryview(window)
+        words = gear[numpy.frombuffer(window, dtype=numpy.uint8)]
+        sums = numpy.cumsum(words, dtype=numpy.uint32)
+        rolling = sums[CHUNK_WINDOW - 1:].copy()
+        rolling[1:] -= sums[:-CHUNK_WINDOW]
+        
+        offset = len(self.tail)
+        cuts = numpy.flatnonzero((rolling & CHUNK_MASK) == CHUNK_MASK) + CHUNK_WINDOW
+        cuts = cuts[cuts > offset]
+        
+        chunk_hashes = []
+        start = offset
+        crc = self.chunk_crc
+        for cut in cuts.tolist():
+            chunk_hashes.append(zlib.crc32(view[start:cut], crc))
+            crc = 0
+            start = cut
+        self.chunk_crc = zlib.crc32(view[start:], crc)
+        self.chunk_pending = start < len(window)
+        self.tail = window[-(CHUNK_WINDOW - 1):]
+        self._add_chunks(chunk_hashes)
+    
+    def _add_chunks(self, chunk_hashes):
+        if not chunk_hashes:
+            return
+        numpy = self.numpy
+        _, multipliers, increments = self._tables
+        
+        values = numpy.array(chunk_hashes, dtype=numpy.uint64) % MERSENNE_PRIME
+        permuted = (multipliers * values[None, :] + increments) % MERSENNE_PRIME
+        numpy.minimum(self.signature, permuted.min(axis=1), out=self.signature)
+        self.chunk_count += len(chunk_hashes)
+    
+    def hexdigest(self):
+        if self.chunk_pending:
+            self._add_chunks([self.chunk_crc])
+            self.chunk_pending = False
+        if not self.chunk_count:
+            return None
+        return self.signature.astype(">u4").tobytes().hex()
+
+
+def new_similarity_digest(file_path):
+    from pathlib import Path
+    
+    if Path(file_path).suffix.lower() not in SIMILARITY_EXTENSIONS:
+        return None
+    try:
+        return SimilarityDigest()
+    except ImportError:
+        return None
+
+
+def parse_minhash(digest):
+    return [int(digest[i:i + 8], 16) for i in range(0, len(digest), 8)]
+
+
+def estimate_similarity(first, second):
+    return sum(1 for a, b in zip(first, second) if a == b) / len(first)
@@ -0,0 +1,70 @@
+import calendar
+import re
+from datetime import datetime, timezone
+
+
+TIMESTAMP_FIELDS = ("created_time", "modified_time", "exif_DateTimeOriginal", "pdf_creation_date", "word_created")
+
+_PDF_DATE = re.compile(r"D?:?(\d{4})(\d\d)?(\d\d)?(\d\d)?(\d\d)?(\d\d)?\s*(?:([Zz+-])(\d\d)?'?(\d\d)?'?)?")
+
+
+def _epoch(parsed):
+    seconds = calendar.timegm(parsed.timetuple()[:6])
+    if parsed.utcoffset() is not None:
+        seconds -= parsed.utcoffset().total_seconds()
+    return float(seconds)
+
+
+def parse_pdf_date(value):
+    match = _PDF_DATE.match(value.strip())
+    if match is None:
+        return None
+    year, month, day, hour, minute, second, sign, offset_hours, offset_minutes = match.groups()
+    try:
+        parsed = datetime(int(year), int(month or 1), int(day or 1), int(hour or 0), int(minute or 0), int(second or 0))
+    except ValueError:
+        return None
+    seconds = _epoch(parsed)
+    if sign in ("+", "-"):
+        offset = int(offset_hours or 0) * 3600 + int(offset_minutes or 0) * 60
+        seconds = seconds - offset if sign == "+" else seconds + offset
+    return seconds
+
+
+def parse_timestamp(field_name, value):
+    if not value or not isinstance(value, str):
+        return None
+    
+    if field_name == "pdf_creation_date":
+        return parse_pdf_date(value)
+    
+    if field_name.startswith("exif_"):
+        value = value.strip()[:19]
+        try:
+            return _epoch(datetime.strptime(value, "%Y:%m:%d %H:%M:%S"))
+        except ValueError:
+            return None
+    
+    try:
+        return _epoch(datetime.fromisoformat(value.strip()))
+    except ValueError:
+        return None
+
+
+def format_timestamp(seconds):
+    return datetime.fromtimestamp(seconds, timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def sweep_clusters(times, window_seconds, min_count=2, max_span_seconds=None):
+    order = sorted(range(len(times)), key=times.__getitem__)
+    cluster = []
+    for position in order:
+        # The span cap stops a steady stream (a bulk copy) from chaining into one case-wide cluster.
+        if cluster and (times[position] - times[cluster[-1]] > window_seconds or
+                        max_span_seconds is not None and times[position] - times[cluster[0]] > max_span_seconds):
+            if len(cluster) >= min_count:
+                yield cluster
+            cluster = []
+        cluster.append(position)
+    if len(cluster) >= min_count:
+        yield cluster
@@ -0,0 +1,118 @@
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from core.hash_utils import calculate_hashes_and_fingerprints
+
+
+PARTIAL_HASH_SIZE = 64 * 1024
+HASH_BATCH_PER_WORKER = 64
+
+
+def partial_hash(file_path, file_size, sample_size=PARTIAL_HASH_SIZE):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as f:
+        digest.update(f.read(sample_size))
+        if file_size > sample_size:
+            f.seek(max(file_size - sample_size, sample_size))
+            digest.update(f.read(sample_size))
+    return digest.hexdigest()
+
+
+def _safe_partial_hash(file_path, file_size):
+    try:
+        return partial_hash(file_path, file_size)
+    except OSError:
+        return None
+
+
+def _map(workers, fn, *iterables):
+    if workers <= 1:
+        return list(map(fn, *iterables))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(fn, *iterables))
+
+
+def is_hash_deferred(file_entry):
+    return file_entry.get("hash_status") == "deferred"
+
+
+def find_duplicate_candidates(files_data, workers=1):
+    by_size = {}
+    for idx, file_entry in enumerate(files_data):
+        file_size = file_entry.get("metadata", {}).get("file_size")
+        if file_size:
+            by_size.setdefault(file_size, []).append(idx)
+    
+    # Stage 1: only sizes shared by several files, and only if one of them still lacks full hashes.
+    colliding = [idx for group in by_size.values() if len(group) > 1 and any(is_hash_deferred(files_data[i]) for i in group)
+                 for idx in group]
+    
+    # Stage 2: head and tail samples split most same-size groups without reading whole files.
+    partials = _map(workers, _safe_partial_hash,
+                    [files_data[idx]["file_path"] for idx in colliding],
+                    [files_data[idx]["metadata"]["file_size"] for idx in colliding])
+    by_partial = {}
+    for idx, partial in zip(colliding, partials):
+        if partial is not None:
+            by_partial.setdefault((files_data[idx]["metadata"]["file_size"], partial), []).append(idx)
+    
+    return [idx for group in by_partial.values() if len(group) > 1 for idx in group if is_hash_deferred(files_data[idx])]
+
+
+def _stat_or_none(file_path):
+    try:
+        return os.stat(file_path)
+    except OSError:
+        return None
+
+
+def hash_deferred_files(files_data, indices, workers=1, progress=None, cancel_event=None, persistent_cache=None):
+    from core.pipeline import store_completed_result
+    
+    hashed = 0
+    
+    def hash_one(idx):
+        if cancel_event is not None and cancel_event.is_set():
+            return idx, None, None
+        file_path = files_data[idx]["file_path"]
+        stat = _stat_or_none(file_path)
+        computed = calculate_hashes_and_fingerprints(file_path)
+        # A file that changed while it was read gets its hashes, but they are not cached.
+        after = _stat_or_none(file_path)
+        if stat is None or after is None or (stat.st_size, stat.st_mtime_ns) != (after.st_size, after.st_mtime_ns):
+            stat = None
+        return idx, computed, stat
+    
+    workers = max(1, workers)
+    batch_size = workers * HASH_BATCH_PER_WORKER
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for start in range(0, len(indices), batch_size):
+            for idx, computed, stat in pool.map(hash_one, indices[start:start + batch_size]):
+                if computed is None:
+                    continue
+                hashes, content_fingerprints = computed
+                file_entry = files_data[idx]
+                file_entry["hashes"] = hashes
+                file_entry["fingerprints"] = {**file_entry.get("fingerprints", {}), **content_fingerprints}
+                file_entry["hash_status"] = "full"
+                # Completed files go back through the caches, so the next run does not defer them again.
+                if stat is not None:
+                    store_completed_result(file_entry, stat, persistent_cache)
+                hashed += 1
+                if progress is not None:
+                    progress(hashed, len(indices))
+    
+    if persistent_cache is not None:
+        persistent_cache.commit()
+    return hashed
+
+
+def resolve_duplicate_candidates(files_data, workers=1, persistent_cache=None):
+    # Stage 3: full hashes only for files whose size and partial hash both collide.
+    return hash_deferred_files(files_data, find_duplicate_candidates(files_data, workers), workers, persistent_cache=persistent_cache)
+
+
+def complete_deferred_hashes(files_data, workers=1, progress=None, cancel_event=None, persistent_cache=None):
+    indices = [idx for idx, file_entry in enumerate(files_data) if is_hash_deferred(file_entry)]
+    return hash_deferred_files(files_data, indices, workers, progress, cancel_event, persistent_cache)
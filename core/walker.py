@@ -0,0 +1,114 @@
+import fnmatch
+import os
+import stat as stat_module
+
+
+DEFAULT_EXCLUDED_DIRS = [
+    "System Volume Information",
+    "$RECYCLE.BIN",
+    "$Recycle.Bin",
+    "Config.Msi",
+    ".Trashes",
+    ".Spotlight-V100",
+    ".fseventsd",
+    ".DocumentRevisions-V100",
+    ".TemporaryItems",
+    "lost+found",
+]
+
+DEFAULT_EXCLUDED_PATHS = ["/proc", "/sys", "/dev", "/run"]
+
+
+def _matches_any(name, patterns):
+    return any(fnmatch.fnmatch(name, pattern) for pattern in patterns)
+
+
+def _normalize_extensions(extensions):
+    if not extensions:
+        return None
+    return {ext.lower() if ext.startswith(".") else f".{ext.lower()}" for ext in extensions}
+
+
+def iter_folder_entries(folder_path, recursive=True, max_depth=None, include=None, exclude=None,
+                        extensions=None, min_size=None, max_size=None, follow_symlinks=False,
+                        excluded_dirs=None, on_error=None):
+    if not recursive:
+        max_depth = 0
+    
+    include = list(include or [])
+    exclude = list(exclude or [])
+    extensions = _normalize_extensions(extensions)
+    excluded_dirs = {name.lower() for name in (DEFAULT_EXCLUDED_DIRS if excluded_dirs is None else excluded_dirs)}
+    excluded_paths = {os.path.normcase(path) for path in DEFAULT_EXCLUDED_PATHS}
+    
+    visited = set()
+    try:
+        root_stat = os.stat(folder_path)
+        visited.add((root_stat.st_dev, root_stat.st_ino))
+    except OSError as e:
+        if on_error:
+            on_error(folder_path, e)
+        return
+    
+    stack = [(os.fspath(folder_path), 0)]
+    
+    while stack:
+        directory, depth = stack.pop()
+        
+        try:
+            scanner = os.scandir(directory)
+        except OSError as e:
+            if on_error:
+                on_error(directory, e)
+            continue
+        
+        with scanner:
+            for entry in scanner:
+                try:
+                    if entry.is_dir(follow_symlinks=follow_symlinks):
+                        if max_depth is not None and depth >= max_depth:
+                            continue
+                        if entry.name.lower() in excluded_dirs or os.path.normcase(entry.path) in excluded_paths:
+                            continue
+                        if exclude and _matches_any(entry.name, exclude):
+                            continue
+                        
+                        dir_stat = entry.stat(follow_symlinks=follow_symlinks)
+                        # st_ino is 0 where scandir does not report it (Windows); fall back to os.stat.
+                        if not dir_stat.st_ino:
+                            dir_stat = os.stat(entry.path, follow_symlinks=follow_symlinks)
+                        dir_key = (dir_stat.st_dev, dir_stat.st_ino)
+                        if dir_key in visited:
+                            continue
+                        visited.add(dir_key)
+                        stack.append((entry.path, depth + 1))
+                        continue
+                    
+                    # File symlinks are always followed, as the old glob scan did; follow_symlinks only
+                    # decides whether to descend into linked directories, which is where loops come from.
+                    if not entry.is_file():
+                        continue
+                    if include and not _matches_any(entry.name, include):
+                        continue
+                    if exclude and _matches_any(entry.name, exclude):
+                        continue
+                    if extensions is not None and os.path.splitext(entry.name)[1].lower() not in extensions:
+                        continue
+                    
+                    file_stat = entry.stat()
+                    if not stat_module.S_ISREG(file_stat.st_mode):
+                        continue
+                    if min_size is not None and file_stat.st_size < min_size:
+                        continue
+                    if max_size is not None and file_stat.st_size > max_size:
+                        continue
+                    
+                    yield entry.path, file_stat
+                except OSError as e:
+                    if on_error:
+                        on_error(entry.path, e)
+
+
+def walk_files(folder_path, **walk_options):
+    for file_path, _ in iter_folder_entries(folder_path, **walk_options):
+        yield file_path
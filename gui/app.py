@@ -1,16 +1,30 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk, scrolledtext
 import json
+import os
+import queue
+import threading
+import time
 from pathlib import Path
-from core.extracter import extract_file_metadata, extract_multiple_files, scan_folder, detect_anomalies
+from core.extracter import extract_file_metadata, scan_folder, detect_anomalies
 from core.hash_utils import calculate_all_hashes
-from core.case_manager import create_case, export_case_json, generate_summary
-from core.report_generator import export_csv, export_pdf, export_html
+from core.pipeline import DEFAULT_WORKERS, iter_extract_files
+from core.extraction_cache import open_extraction_cache
+from core.case_manager import create_case, export_case_json, generate_summary, load_case_json, materialize_case_records
+from core.case_store import CASE_STORE_SUFFIX, save_case_store, open_case_store
+from core.correlation import add_correlations_to_case
+from core.triage import resolve_duplicate_candidates, complete_deferred_hashes
+from core.report_generator import TABLE_FORMATS, export_csv, export_table, export_pdf, export_html
 from core.logger import log_action, export_logs, get_logs_summary, get_all_logs
 from core.email_sender import send_report_email
 from core.project_info import get_info_text
 
 
+ANALYSIS_POLL_MS = 100
+ANALYSIS_BATCH_SIZE = 200
+TREE_PAGE_SIZE = 200
+PDF_SUMMARY_SUGGESTED_FILES = 2000
+
 def start_gui():
     root = tk.Tk()
     root.title("MetaTrace Desktop")
@@ -18,6 +32,9 @@ def start_gui():
     
     selected_files = []
     case_data = None
+    analysis = None
+    view = {"files": [], "correlations": [], "file_page": 0, "corr_page": 0, "lazy": {}}
+    extraction_cache = open_extraction_cache()
     
     def browse_files():
         nonlocal selected_files
@@ -31,11 +48,11 @@ def start_gui():
         folder = filedialog.askdirectory()
         if folder:
             recursive = messagebox.askyesno("Scan Folder", "Scan subfolders recursively?")
-            results = scan_folder(folder, recursive=recursive)
-            if isinstance(results, dict) and "error" in results:
-                messagebox.showerror("Error", results["error"])
+            file_paths = scan_folder(folder, recursive=recursive, analyze=False)
+            if isinstance(file_paths, dict) and "error" in file_paths:
+                messagebox.showerror("Error", file_paths["error"])
                 return
-            selected_files = [f["file_path"] for f in results]
+            selected_files = file_paths
             update_file_list()
     
     def remove_selected_file():
@@ -55,72 +72,416 @@ def start_gui():
         for file_path in selected_files:
             file_list.insert(tk.END, Path(file_path).name)
     
+    def format_bytes(num_bytes):
+        for unit in ["B", "KB", "MB", "GB"]:
+            if num_bytes < 1024:
+                return f"{num_bytes:.1f} {unit}"
+            num_bytes /= 1024
+        return f"{num_bytes:.1f} TB"
+    
+    def format_eta(seconds):
+        seconds = int(seconds)
+        return f"{seconds // 3600}:{(seconds % 3600) // 60:02d}:{seconds % 60:02d}"
+    
+    def file_child_rows(file_entry):
+        metadata = file_entry["metadata"]
+        rows = [
+            ("Name", metadata.get("file_name", "N/A")),
+            ("Size", metadata.get("file_size", "N/A")),
+            ("Author", metadata.get("author", "N/A")),
+            ("Created Time", metadata.get("created_time", "N/A")),
+            ("Modified Time", metadata.get("modified_time", "N/A")),
+            ("Signature Valid", metadata.get("signature_valid", "N/A"))
+        ]
+        
+        if metadata.get("signature_warning"):
+            rows.append(("⚠ WARNING", metadata["signature_warning"]))
+        
+        if file_entry.get("anomalies"):
+            rows.append(("ANOMALIES", ""))
+            for anomaly in file_entry["anomalies"]:
+                rows.append((f"  [{anomaly['severity'].upper()}]", anomaly["message"]))
+        
+        rows.append(("Hashes", "deferred (triage)" if file_entry.get("hash_status") == "deferred" else ""))
+        for algo, hash_val in file_entry["hashes"].items():
+            rows.append((f"  {algo.upper()}", hash_val[:32] + "..."))
+        
+        return rows
+    
+    def correlation_child_rows(corr):
+        return [
+            ("Type", corr["type"]),
+            ("Matched Value", str(corr["matched_value"])[:60]),
+            ("File Count", corr["file_count"]),
+            ("Confidence", f"{corr['confidence']}%"),
+            ("Explanation", corr["explanation"])
+        ]
+    
+    def insert_lazy_node(kind, idx, values):
+        iid = tree.insert("", "end", values=values, open=False)
+        tree.insert(iid, "end", values=("Loading...", ""))
+        view["lazy"][iid] = (kind, idx)
+    
+    def insert_file_node(file_idx):
+        file_entry = view["files"][file_idx]
+        metadata = file_entry["metadata"]
+        anomaly_count = len(file_entry.get("anomalies", []))
+        label = f"{metadata.get('file_name', 'N/A')} ({metadata.get('file_size', 'N/A')} bytes"
+        label += f", {anomaly_count} anomalies)" if anomaly_count else ")"
+        insert_lazy_node("file", file_idx, (f"FILE {file_idx + 1}", label))
+    
+    def insert_correlation_node(corr_idx):
+        corr = view["correlations"][corr_idx]
+        label = f"{str(corr['matched_value'])[:60]} ({corr['file_count']} files, {corr['confidence']}%)"
+        insert_lazy_node("correlation", corr_idx, (f"[{corr['type'].upper()}]", label))
+    
+    def on_tree_open(event):
+        iid = tree.focus()
+        node = view["lazy"].pop(iid, None)
+        if node is None:
+            return
+        
+        kind, idx = node
+        if kind == "file":
+            rows = file_child_rows(view["files"][idx])
+        else:
+            rows = correlation_child_rows(view["correlations"][idx])
+        
+        tree.delete(*tree.get_children(iid))
+        for values in rows:
+            tree.insert(iid, "end", values=values)
+    
+    def page_count(total):
+        return max(1, (total + TREE_PAGE_SIZE - 1) // TREE_PAGE_SIZE)
+    
+    def page_range(page, total):
+        first = page * TREE_PAGE_SIZE
+        return range(first, min(first + TREE_PAGE_SIZE, total))
+    
+    def update_pager():
+        files_total = len(view["files"])
+        corr_total = len(view["correlations"])
+        files_page_label.config(text=f"Files page {view['file_page'] + 1}/{page_count(files_total)} ({files_total} files)")
+        corr_page_label.config(text=f"Correlations page {view['corr_page'] + 1}/{page_count(corr_total)} ({corr_total} found)")
+    
+    def render_view():
+        tree.delete(*tree.get_children())
+        view["lazy"] = {}
+        
+        if case_data is not None:
+            summary = generate_summary(case_data)
+            rows = [
+                ("CASE SUMMARY", ""),
+                ("Case ID", summary["case_id"]),
+                ("Total Files", summary["total_files"]),
+                ("Total Anomalies", summary["total_anomalies"]),
+                ("Critical Anomalies", summary["critical_anomalies"]),
+                ("Files with Signature Issues", summary["files_with_signature_issues"]),
+                ("Correlations Found", case_data.get("correlation_count", 0)),
+                ("", "")
+            ]
+            for values in rows:
+                tree.insert("", "end", values=values)
+        
+        if view["correlations"]:
+            tree.insert("", "end", values=("CORRELATIONS", ""))
+            for corr_idx in page_range(view["corr_page"], len(view["correlations"])):
+                insert_correlation_node(corr_idx)
+            tree.insert("", "end", values=("", ""))
+        
+        if view["files"]:
+            tree.insert("", "end", values=("FILES", ""))
+            for file_idx in page_range(view["file_page"], len(view["files"])):
+                insert_file_node(file_idx)
+        
+        update_pager()
+    
+    def change_page(key, total, step):
+        page = min(max(view[key] + step, 0), page_count(total) - 1)
+        if page != view[key]:
+            view[key] = page
+            render_view()
+    
+    def show_file_page(step):
+        change_page("file_page", len(view["files"]), step)
+    
+    def show_correlation_page(step):
+        change_page("corr_page", len(view["correlations"]), step)
+    
+    def reset_view(files, correlations):
+        view["files"] = files
+        view["correlations"] = correlations
+        view["file_page"] = 0
+        view["corr_page"] = 0
+        render_view()
+    
+    def append_streamed_file(file_entry):
+        file_idx = len(view["files"])
+        view["files"].append(file_entry)
+        if file_idx == 0:
+            tree.insert("", "end", values=("FILES", ""))
+        if file_idx in page_range(view["file_page"], file_idx + 1):
+            insert_file_node(file_idx)
+    
+    def run_analysis(file_entries, triage, messages, cancel_event):
+        files_data = []
+        bytes_done = 0
+        results = iter_extract_files(file_entries, workers=DEFAULT_WORKERS, persistent_cache=extraction_cache, triage=triage)
+        
+        try:
+            for result in results:
+                if cancel_event.is_set():
+                    break
+                files_data.append(result)
+                bytes_done += result["metadata"].get("file_size", 0) or 0
+                messages.put(("file", result, len(files_data), bytes_done))
+        except Exception as e:
+            messages.put(("error", str(e)))
+            return
+        finally:
+            results.close()
+        
+        if cancel_event.is_set():
+            messages.put(("cancelled", len(files_data)))
+            return
+        
+        try:
+            if triage:
+                messages.put(("status", "Hashing files whose size and partial hash collide..."))
+                resolve_duplicate_candidates(files_data, DEFAULT_WORKERS, extraction_cache)
+            messages.put(("status", "Correlating files..."))
+            messages.put(("done", create_case("Auto Case", files_data)))
+        except Exception as e:
+            messages.put(("error", str(e)))
+    
+    def run_hash_completion(case, messages, cancel_event):
+        def progress(done, total):
+            messages.put(("status", f"Hashed {done}/{total} deferred files..."))
+        
+        try:
+            complete_deferred_hashes(case["files"], DEFAULT_WORKERS, progress, cancel_event, extraction_cache)
+            messages.put(("status", "Correlating files..."))
+            messages.put(("done", add_correlations_to_case(case)))
+        except Exception as e:
+            messages.put(("error", str(e)))
+    
+    def run_pdf_export(case, export_path, summary_only, messages, cancel_event):
+        def progress(done, total, label):
+            messages.put(("progress", done, total, f"PDF report: rendered {label} ({done}/{total} sections)"))
+        
+        try:
+            messages.put(("exported", export_pdf(case, export_path, summary_only=summary_only, workers=DEFAULT_WORKERS, progress=progress)))
+        except Exception as e:
+            messages.put(("exported", {"success": False, "error": str(e)}))
+    
+    def start_analysis_thread(target, args, total_files=0, total_bytes=0):
+        nonlocal analysis
+        analysis = {
+            "messages": queue.Queue(),
+            "cancel": threading.Event(),
+            "total_files": total_files,
+            "total_bytes": total_bytes,
+            "started": time.monotonic()
+        }
+        analysis["thread"] = threading.Thread(
+            target=target,
+            args=(*args, analysis["messages"], analysis["cancel"]),
+            daemon=True
+        )
+        analysis["thread"].start()
+        cancel_button.config(state=tk.NORMAL)
+        root.after(ANALYSIS_POLL_MS, poll_analysis)
+    
     def load_files_data():
-        nonlocal case_data
+        if analysis is not None:
+            messagebox.showinfo("Analyze", "An analysis is already running")
+            return
         if not selected_files:
             messagebox.showerror("Error", "No files selected")
             return
         
-        files_data = extract_multiple_files(selected_files)
-        case_data = create_case("Auto Case", files_data)
+        file_entries = []
+        total_bytes = 0
+        for file_path in selected_files:
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                file_entries.append(file_path)
+                continue
+            file_entries.append((file_path, stat))
+            total_bytes += stat.st_size
+        
+        reset_view([], [])
+        progress_bar.configure(maximum=len(file_entries), value=0)
+        progress_label.config(text=f"Analyzing 0/{len(file_entries)} files...")
+        start_analysis_thread(run_analysis, (file_entries, triage_mode.get()), len(file_entries), total_bytes)
+    
+    def complete_hashes():
+        if analysis is not None:
+            messagebox.showinfo("Complete Hashes", "An analysis is already running")
+            return
+        if case_data is None:
+            messagebox.showerror("Error", "No case data to complete")
+            return
         
-        log_action("ANALYZE", files=[f.get("file_path", "") for f in files_data])
+        deferred = sum(1 for f in case_data["files"] if f.get("hash_status") == "deferred")
+        if not deferred:
+            messagebox.showinfo("Complete Hashes", "All files already have full hashes")
+            return
         
-        tree.delete(*tree.get_children())
-        summary = generate_summary(case_data)
-        
-        tree.insert("", "end", values=("CASE SUMMARY", ""))
-        tree.insert("", "end", values=("Case ID", summary["case_id"]))
-        tree.insert("", "end", values=("Total Files", summary["total_files"]))
-        tree.insert("", "end", values=("Total Anomalies", summary["total_anomalies"]))
-        tree.insert("", "end", values=("Critical Anomalies", summary["critical_anomalies"]))
-        tree.insert("", "end", values=("Files with Signature Issues", summary["files_with_signature_issues"]))
-        tree.insert("", "end", values=("Correlations Found", case_data.get("correlation_count", 0)))
-        tree.insert("", "end", values=("", ""))
-        
-        if case_data.get("correlations"):
-            tree.insert("", "end", values=("CORRELATIONS", ""))
-            for corr in case_data["correlations"]:
-                tree.insert("", "end", values=(f"[{corr['type'].upper()}]", ""))
-                tree.insert("", "end", values=("  Type", corr["type"]))
-                tree.insert("", "end", values=("  Matched Value", str(corr["matched_value"])[:60]))
-                tree.insert("", "end", values=("  File Count", corr["file_count"]))
-                tree.insert("", "end", values=("  Confidence", f"{corr['confidence']}%"))
-                tree.insert("", "end", values=("  Explanation", corr["explanation"]))
-                tree.insert("", "end", values=("", ""))
-        
-        for file_idx, file_entry in enumerate(case_data["files"], 1):
-            tree.insert("", "end", values=(f"FILE {file_idx}", ""))
-            tree.insert("", "end", values=("Name", file_entry["metadata"].get("file_name", "N/A")))
-            tree.insert("", "end", values=("Size", file_entry["metadata"].get("file_size", "N/A")))
-            tree.insert("", "end", values=("Author", file_entry["metadata"].get("author", "N/A")))
-            tree.insert("", "end", values=("Created Time", file_entry["metadata"].get("created_time", "N/A")))
-            tree.insert("", "end", values=("Modified Time", file_entry["metadata"].get("modified_time", "N/A")))
-            tree.insert("", "end", values=("Signature Valid", file_entry["metadata"].get("signature_valid", "N/A")))
-            
-            if file_entry["metadata"].get("signature_warning"):
-                tree.insert("", "end", values=("⚠ WARNING", file_entry["metadata"]["signature_warning"]))
-            
-            if file_entry.get("anomalies"):
-                tree.insert("", "end", values=("ANOMALIES", ""))
-                for anomaly in file_entry["anomalies"]:
-                    tree.insert("", "end", values=(f"  [{anomaly['severity'].upper()}]", anomaly["message"]))
-            
-            tree.insert("", "end", values=("Hashes", ""))
-            for algo, hash_val in file_entry["hashes"].items():
-                tree.insert("", "end", values=(f"  {algo.upper()}", hash_val[:32] + "..."))
+        materialize_case_records(case_data)
+        progress_label.config(text=f"Hashing {deferred} deferred files...")
+        start_analysis_thread(run_hash_completion, (case_data,))
+    
+    def save_case():
+        if analysis is not None:
+            messagebox.showinfo("Save Case", "An analysis is already running")
+            return
+        if case_data is None:
+            messagebox.showerror("Error", "No case data to save")
+            return
+        
+        save_path = filedialog.asksaveasfilename(
+            defaultextension=CASE_STORE_SUFFIX,
+            filetypes=[("MetaTrace cases", f"*{CASE_STORE_SUFFIX}"), ("All files", "*.*")]
+        )
+        
+        if save_path:
+            result = save_case_store(case_data, save_path)
+            if result["success"]:
+                log_action("SAVE_CASE", files=[save_path])
+                messagebox.showinfo("Success", result["message"])
+            else:
+                messagebox.showerror("Error", result["error"])
+    
+    def open_case():
+        nonlocal case_data
+        if analysis is not None:
+            messagebox.showinfo("Open Case", "An analysis is already running")
+            return
+        
+        open_path = filedialog.askopenfilename(
+            filetypes=[
+                ("MetaTrace cases", f"*{CASE_STORE_SUFFIX}"),
+                ("Case exports", "*.json *.jsonl *.json.gz *.jsonl.gz *.json.xz *.jsonl.xz"),
+                ("All files", "*.*")
+            ]
+        )
+        if not open_path:
+            return
+        
+        if open_path.lower().endswith(CASE_STORE_SUFFIX):
+            result = open_case_store(open_path)
+        else:
+            result = load_case_json(open_path)
+        if not result["success"]:
+            log_action("OPEN_CASE", files=[open_path], error=result["error"])
+            messagebox.showerror("Error", result["error"])
+            return
+        
+        previous_store = case_data.get("_case_store") if case_data is not None else None
+        if previous_store is not None:
+            previous_store.close()
+        case_data = result["case"]
+        reset_view(case_data["files"], case_data.get("correlations", []))
+        log_action("OPEN_CASE", files=[open_path])
+        progress_label.config(text=f"Opened case {case_data.get('case_name', '')}: {len(case_data['files'])} files")
+    
+    def cancel_analysis():
+        if analysis is not None:
+            analysis["cancel"].set()
+            progress_label.config(text="Cancelling...")
+    
+    def finish_analysis(message):
+        nonlocal analysis
+        analysis = None
+        cancel_button.config(state=tk.DISABLED)
+        progress_label.config(text=message)
+    
+    def poll_analysis():
+        nonlocal case_data
+        if analysis is None:
+            return
+        
+        messages = analysis["messages"]
+        streamed = False
+        for _ in range(ANALYSIS_BATCH_SIZE):
+            try:
+                message = messages.get_nowait()
+            except queue.Empty:
+                break
             
-            tree.insert("", "end", values=("", ""))
+            kind = message[0]
+            if kind == "file":
+                _, file_entry, files_done, bytes_done = message
+                append_streamed_file(file_entry)
+                streamed = True
+                progress_bar.configure(value=files_done)
+                
+                elapsed = time.monotonic() - analysis["started"]
+                if bytes_done and analysis["total_bytes"]:
+                    remaining = elapsed / bytes_done * max(analysis["total_bytes"] - bytes_done, 0)
+                else:
+                    remaining = elapsed / files_done * (analysis["total_files"] - files_done)
+                progress_label.config(
+                    text=f"Analyzed {files_done}/{analysis['total_files']} files - "
+                         f"{format_bytes(bytes_done)} of {format_bytes(analysis['total_bytes'])} hashed - "
+                         f"ETA {format_eta(remaining)}"
+                )
+            elif kind == "status":
+                progress_label.config(text=message[1])
+            elif kind == "progress":
+                _, done, total, text = message
+                progress_bar.configure(maximum=total, value=done)
+                progress_label.config(text=text)
+            elif kind == "exported":
+                result = message[1]
+                if result["success"]:
+                    finish_analysis(result["message"])
+                    messagebox.showinfo("Success", result["message"])
+                else:
+                    finish_analysis("Export failed")
+                    messagebox.showerror("Error", result["error"])
+                return
+            elif kind == "done":
+                case_data = message[1]
+                reset_view(case_data["files"], case_data.get("correlations", []))
+                log_action("ANALYZE", files=[f.get("file_path", "") for f in case_data["files"]])
+                elapsed = time.monotonic() - analysis["started"]
+                finish_analysis(f"Analysis complete: {case_data['total_files']} files in {format_eta(elapsed)}")
+                return
+            elif kind == "cancelled":
+                log_action("ANALYZE_CANCELLED", files=[], error=f"Cancelled after {message[1]} files")
+                finish_analysis(f"Analysis cancelled after {message[1]} files")
+                return
+            elif kind == "error":
+                log_action("ANALYZE", files=[], error=message[1])
+                finish_analysis("Analysis failed")
+                messagebox.showerror("Error", message[1])
+                return
+        
+        # Refreshed once per poll cycle rather than per file, so the "(N files)" count stays current cheaply.
+        if streamed:
+            update_pager()
+        root.after(ANALYSIS_POLL_MS, poll_analysis)
     
     def export_json():
         nonlocal case_data
+        if analysis is not None:
+            messagebox.showinfo("Export JSON", "An analysis is already running")
+            return
         if case_data is None:
             messagebox.showerror("Error", "No case data to export")
             return
         
         export_path = filedialog.asksaveasfilename(
             defaultextension=".json",
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+            filetypes=[
+                ("JSON files", "*.json"),
+                ("JSON Lines files", "*.jsonl"),
+                ("Compressed JSON", "*.json.gz *.jsonl.gz *.json.xz *.jsonl.xz"),
+                ("All files", "*.*")
+            ]
         )
         
         if export_path:
@@ -132,17 +493,23 @@ def start_gui():
     
     def export_csv_report():
         nonlocal case_data
+        if analysis is not None:
+            messagebox.showinfo("Export Table", "An analysis is already running")
+            return
         if case_data is None:
             messagebox.showerror("Error", "No case data to export")
             return
         
         export_path = filedialog.asksaveasfilename(
             defaultextension=".csv",
-            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+            filetypes=[("CSV files", "*.csv"), ("Parquet tables", "*.parquet"), ("Feather tables", "*.feather"), ("All files", "*.*")]
         )
         
         if export_path:
-            result = export_csv(case_data, export_path)
+            if Path(export_path).suffix.lower() in TABLE_FORMATS:
+                result = export_table(case_data, export_path)
+            else:
+                result = export_csv(case_data, export_path)
             if result["success"]:
                 messagebox.showinfo("Success", result["message"])
             else:
@@ -150,6 +517,9 @@ def start_gui():
     
     def export_pdf_report():
         nonlocal case_data
+        if analysis is not None:
+            messagebox.showinfo("PDF Report", "An analysis is already running")
+            return
         if case_data is None:
             messagebox.showerror("Error", "No case data to export")
             return
@@ -160,14 +530,23 @@ def start_gui():
         )
         
         if export_path:
-            result = export_pdf(case_data, export_path)
-            if result["success"]:
-                messagebox.showinfo("Success", result["message"])
-            else:
-                messagebox.showerror("Error", result["error"])
+            summary_only = False
+            if len(case_data["files"]) > PDF_SUMMARY_SUGGESTED_FILES:
+                summary_only = messagebox.askyesno(
+                    "PDF Report",
+                    f"This case has {len(case_data['files'])} files. Export a summary with the top anomalies instead of every file?"
+                )
+            
+            progress_label.config(text="PDF report: rendering...")
+            start_analysis_thread(run_pdf_export, (case_data, export_path, summary_only))
+            # Rendering has no cancellation points.
+            cancel_button.config(state=tk.DISABLED)
     
     def export_html_report():
         nonlocal case_data
+        if analysis is not None:
+            messagebox.showinfo("HTML Report", "An analysis is already running")
+            return
         if case_data is None:
             messagebox.showerror("Error", "No case data to export")
             return
@@ -309,6 +688,11 @@ def start_gui():
     tk.Button(frame_top, text="Scan Folder", command=browse_folder, bg="#2196F3", fg="white").pack(side="left", padx=5)
     tk.Button(frame_top, text="Remove Selected", command=remove_selected_file, bg="#f44336", fg="white").pack(side="left", padx=5)
     tk.Button(frame_top, text="Analyze", command=load_files_data, bg="#FF9800", fg="white").pack(side="left", padx=5)
+    triage_mode = tk.BooleanVar(value=False)
+    tk.Checkbutton(frame_top, text="Triage (defer full hashes)", variable=triage_mode).pack(side="left", padx=5)
+    tk.Button(frame_top, text="Complete Hashes", command=complete_hashes, bg="#795548", fg="white").pack(side="left", padx=5)
+    tk.Button(frame_top, text="Open Case", command=open_case, bg="#3F51B5", fg="white").pack(side="left", padx=5)
+    tk.Button(frame_top, text="Save Case", command=save_case, bg="#3F51B5", fg="white").pack(side="left", padx=5)
     
     frame_export = tk.Frame(root)
     frame_export.pack(pady=5, padx=10, fill="x")
@@ -329,9 +713,32 @@ def start_gui():
     file_list = tk.Listbox(frame_files, height=4)
     file_list.pack(fill="x", padx=5)
     
+    frame_progress = tk.Frame(root)
+    frame_progress.pack(pady=5, padx=10, fill="x")
+    
+    progress_bar = ttk.Progressbar(frame_progress, mode="determinate")
+    progress_bar.pack(side="left", fill="x", expand=True, padx=5)
+    cancel_button = tk.Button(frame_progress, text="Cancel", command=cancel_analysis, bg="#f44336", fg="white", state=tk.DISABLED)
+    cancel_button.pack(side="left", padx=5)
+    progress_label = tk.Label(root, text="", anchor="w")
+    progress_label.pack(padx=15, fill="x")
+    
+    frame_pager = tk.Frame(root)
+    frame_pager.pack(pady=5, padx=10, fill="x")
+    
+    tk.Button(frame_pager, text="◀", command=lambda: show_correlation_page(-1), width=3).pack(side="left", padx=2)
+    corr_page_label = tk.Label(frame_pager, text="")
+    corr_page_label.pack(side="left", padx=5)
+    tk.Button(frame_pager, text="▶", command=lambda: show_correlation_page(1), width=3).pack(side="left", padx=2)
+    
+    tk.Button(frame_pager, text="▶", command=lambda: show_file_page(1), width=3).pack(side="right", padx=2)
+    files_page_label = tk.Label(frame_pager, text="")
+    files_page_label.pack(side="right", padx=5)
+    tk.Button(frame_pager, text="◀", command=lambda: show_file_page(-1), width=3).pack(side="right", padx=2)
+    
     columns = ("Property", "Value")
     tree = ttk.Treeview(root, columns=columns, height=25)
-    tree.column("#0", width=0, stretch=tk.NO)
+    tree.column("#0", width=30, stretch=tk.NO)
     tree.column("Property", anchor=tk.W, width=250)
     tree.column("Value", anchor=tk.W, width=700)
     
@@ -339,6 +746,8 @@ def start_gui():
     tree.heading("Property", text="Property", anchor=tk.W)
     tree.heading("Value", text="Value", anchor=tk.W)
     
+    tree.bind("<<TreeviewOpen>>", on_tree_open)
     tree.pack(padx=10, pady=10, fill="both", expand=True)
+    update_pager()
     
     root.mainloop()
\ No newline at end of file
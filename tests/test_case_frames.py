@@ -0,0 +1,74 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.case_frames import case_frames, case_to_frames, filter_files, frame_summary
+from core.case_store import open_case_store, save_case_store
+
+
+def sample_case():
+    files = [
+        {
+            "file_path": "/evidence/report.PDF",
+            "metadata": {"file_name": "report.PDF", "file_size": 2048, "file_extension": ".PDF", "pdf_author": "alice"},
+            "hashes": {"md5": "a" * 32, "sha256": "b" * 64},
+            "anomalies": [{"type": "timestamp", "severity": "high", "message": "created after modified"}]
+        },
+        {
+            "file_path": "/evidence/photo.jpg",
+            "metadata": {"file_name": "photo.jpg", "file_size": 512, "file_extension": ".jpg", "signature_valid": False},
+            "hashes": {"md5": "c" * 32, "sha256": "d" * 64},
+            "anomalies": []
+        }
+    ]
+    correlations = [
+        {"type": "metadata_match", "matched_field": "pdf_author", "matched_value": "alice", "file_count": 40,
+         "file_indices": [0, 1], "stop_value": True, "confidence": 20},
+        {"type": "hash_match", "matched_field": "md5", "matched_value": "a" * 32, "file_count": 2,
+         "file_indices": [0, 1], "confidence": 100}
+    ]
+    return {"case_id": "1", "case_name": "frames", "created_at": "2026-01-01T00:00:00", "total_files": len(files),
+            "files": files, "correlations": correlations, "correlation_count": len(correlations)}
+
+
+def test_record_and_store_frames_agree(tmp_path):
+    case = sample_case()
+    assert save_case_store(case, tmp_path / "case.mtcase")["success"]
+    opened = open_case_store(tmp_path / "case.mtcase")
+    
+    try:
+        for frames in (case_to_frames(case), case_to_frames(opened["case"])):
+            assert frames["correlations"]["file_count"].tolist() == [40, 2]
+            assert frame_summary(frames) == frame_summary(case_to_frames(case))
+    finally:
+        opened["store"].close()
+
+
+def test_summary_counts(tmp_path):
+    from core.case_manager import generate_summary
+    from core.report_generator import report_stats
+    
+    case = sample_case()
+    summary = generate_summary(case)
+    assert summary["total_anomalies"] == 1
+    assert summary["critical_anomalies"] == 1
+    assert summary["files_with_signature_issues"] == 1
+    assert report_stats(case) == {"total_files": 2, "correlation_count": 2, "total_anomalies": 1, "high_confidence": 1}
+
+
+def test_filter_files_ignores_extension_case():
+    frames = case_frames(sample_case())
+    
+    assert filter_files(frames, extension=".pdf")["file_name"].tolist() == ["report.PDF"]
+    assert filter_files(frames, extension=".JPG")["file_name"].tolist() == ["photo.jpg"]
+
+
+def test_summary_of_case_without_anomalies():
+    case = sample_case()
+    for file_data in case["files"]:
+        file_data["anomalies"] = []
+    
+    summary = frame_summary(case_to_frames(case))
+    assert summary["total_anomalies"] == 0
+    assert summary["files_with_anomalies"] == 0
@@ -0,0 +1,72 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core import case_io
+from core.case_io import clean_file_record, iter_case_records, read_case_file, write_case_file
+
+
+CASE_SUFFIXES = [".json", ".jsonl", ".json.gz", ".jsonl.gz", ".json.xz", ".jsonl.xz"]
+
+
+def sample_case(file_count=20):
+    files = [{
+        "file_path": f"/evidence/ünïcode {index}.pdf",
+        "metadata": {"file_name": f"ünïcode {index}.pdf", "file_size": 1000 + index, "ratio": -12.5e-3 * index,
+                     "pdf_author": "alice \"quoted\" \\ name", "parse_error": "dropped on save", "tags": [1, [2, {"x": None}]]},
+        "hashes": {"md5": f"{index:032x}", "sha256": f"{index:064x}"},
+        "hash_status": "full",
+        "anomalies": [{"type": "timestamp", "severity": "high", "message": "created, after: modified ]}"}],
+        "fingerprints": {"width": 300, "height": 200}
+    } for index in range(file_count)]
+    correlations = [{"type": "metadata_match", "matched_field": "pdf_author", "matched_value": "alice",
+                     "file_count": file_count, "file_indices": list(range(file_count)), "confidence": 95}]
+    return {"case_id": "20260101_000000", "case_name": "round trip", "created_at": "2026-01-01T00:00:00",
+            "total_files": file_count, "correlation_count": 1, "files": files, "correlations": correlations,
+            "_correlation_engine": object()}
+
+
+def expected_case(case):
+    return {**case_io.case_header(case), "files": [clean_file_record(f) for f in case["files"]],
+            "correlations": case["correlations"]}
+
+
+@pytest.mark.parametrize("suffix", CASE_SUFFIXES)
+def test_case_file_round_trip(tmp_path, suffix):
+    case = sample_case()
+    path = tmp_path / f"case{suffix}"
+    write_case_file(case, path)
+    
+    assert read_case_file(path) == expected_case(case)
+
+
+@pytest.mark.parametrize("suffix", CASE_SUFFIXES)
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64])
+def test_records_span_buffer_boundaries(tmp_path, monkeypatch, suffix, chunk_size):
+    case = sample_case(5)
+    path = tmp_path / f"case{suffix}"
+    write_case_file(case, path)
+    monkeypatch.setattr(case_io, "READ_CHUNK_SIZE", chunk_size)
+    
+    assert read_case_file(path) == expected_case(case)
+
+
+def test_streams_records_in_file_order(tmp_path):
+    case = sample_case(3)
+    path = tmp_path / "case.json"
+    write_case_file(case, path)
+    
+    kinds = [kind for kind, _ in iter_case_records(path)]
+    assert kinds == ["case", "file", "file", "file", "correlation"]
+
+
+def test_reads_fields_after_records(tmp_path, monkeypatch):
+    path = tmp_path / "case.json"
+    path.write_text('{ "case_name" : "late",\n "files" : [ {"n": 1.5e-3} , {"n": -2} ] ,\n "correlations": [],\n "total_files": 2 }\n',
+                    encoding="utf-8")
+    monkeypatch.setattr(case_io, "READ_CHUNK_SIZE", 3)
+    
+    assert read_case_file(path) == {"case_name": "late", "files": [{"n": 1.5e-3}, {"n": -2}], "correlations": [], "total_files": 2}
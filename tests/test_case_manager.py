@@ -0,0 +1,52 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.case_manager import add_files_to_case, create_case, generate_summary, remove_files_from_case
+from core.case_store import open_case_store, save_case_store
+
+
+def file_record(name, author, severity=None):
+    return {
+        "file_path": f"/evidence/{name}",
+        "metadata": {"file_name": name, "file_size": 100, "file_extension": ".pdf", "pdf_author": author},
+        "hashes": {"md5": name.ljust(32, "0"), "sha256": name.ljust(64, "0")},
+        "anomalies": [{"type": "timestamp", "severity": severity, "message": "odd"}] if severity else []
+    }
+
+
+def reopen(case, path):
+    assert save_case_store(case, path)["success"]
+    return open_case_store(path)
+
+
+def test_add_files_to_stored_case(tmp_path):
+    opened = reopen(create_case("stored", [file_record("a.pdf", "alice", "high")]), tmp_path / "case.mtcase")
+    case = opened["case"]
+    
+    try:
+        add_files_to_case(case, [file_record("b.pdf", "alice")])
+        
+        assert [f["metadata"]["file_name"] for f in case["files"]] == ["a.pdf", "b.pdf"]
+        assert case["total_files"] == 2
+        assert any(c["matched_field"] == "pdf_author" and c["file_indices"] == [0, 1] for c in case["correlations"])
+        assert generate_summary(case)["critical_anomalies"] == 1
+    finally:
+        opened["store"].close()
+
+
+def test_remove_files_from_stored_case(tmp_path):
+    records = [file_record("a.pdf", "alice", "high"), file_record("b.pdf", "alice"), file_record("c.pdf", "bob")]
+    opened = reopen(create_case("stored", records), tmp_path / "case.mtcase")
+    case = opened["case"]
+    
+    try:
+        remove_files_from_case(case, [0])
+        
+        assert [f["metadata"]["file_name"] for f in case["files"]] == ["b.pdf", "c.pdf"]
+        assert case["total_files"] == 2
+        assert not any(c["matched_field"] == "pdf_author" for c in case["correlations"])
+        assert generate_summary(case)["total_anomalies"] == 0
+    finally:
+        opened["store"].close()
@@ -0,0 +1,21 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.case_manager import create_case
+from core.correlation import default_correlation_rules, find_software_correlation
+
+
+def pdf_record(name, producer):
+    return {"file_path": f"/evidence/{name}", "metadata": {"file_name": name, "pdf_producer": producer},
+            "hashes": {}, "anomalies": []}
+
+
+def test_producer_groups_are_reported_once():
+    files = [pdf_record("a.pdf", "Acrobat Distiller"), pdf_record("b.pdf", "Acrobat Distiller")]
+    case = create_case("software", files)
+    
+    assert "software_match" not in default_correlation_rules()
+    assert [c["type"] for c in case["correlations"] if c.get("matched_value") == "Acrobat Distiller"] == ["metadata_match"]
+    assert find_software_correlation(files)[0]["file_indices"] == [0, 1]
@@ -0,0 +1,67 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.extraction_cache import open_extraction_cache
+from core.pipeline import clear_session_cache, iter_extract_files
+
+
+def extract(paths, cache):
+    clear_session_cache()
+    return list(iter_extract_files([str(path) for path in paths], workers=1, persistent_cache=cache))
+
+
+def test_cache_hit_equals_fresh_extraction(tmp_path):
+    from PIL import Image
+    
+    cached_path = tmp_path / "cached.png"
+    fresh_path = tmp_path / "fresh.png"
+    Image.new("RGB", (300, 200)).save(cached_path)
+    Image.new("RGB", (300, 200)).save(fresh_path)
+    cache = open_extraction_cache(tmp_path / "cache.sqlite3")
+    
+    first = extract([cached_path], cache)[0]
+    hit, fresh = extract([cached_path, fresh_path], cache)
+    
+    assert hit == first
+    assert hit["metadata"]["image_size"] == fresh["metadata"]["image_size"]
+    assert type(hit["metadata"]["image_size"]) is type(fresh["metadata"]["image_size"])
+
+
+def test_cached_and_fresh_files_correlate(tmp_path):
+    from PIL import Image
+    from core.case_manager import create_case
+    
+    paths = [tmp_path / "a.png", tmp_path / "b.png"]
+    for path in paths:
+        Image.new("RGB", (300, 200)).save(path)
+    cache = open_extraction_cache(tmp_path / "cache.sqlite3")
+    extract(paths[:1], cache)
+    
+    case = create_case("cache", extract(paths, cache), correlation_rules=["metadata_match"])
+    assert any(correlation.get("matched_field") == "image_size" and correlation["file_indices"] == [0, 1]
+               for correlation in case["correlations"])
+
+
+def test_completed_hashes_are_cached(tmp_path, monkeypatch):
+    from PIL import Image
+    from core import pipeline
+    from core.triage import complete_deferred_hashes
+    
+    path = tmp_path / "deferred.png"
+    Image.new("RGB", (300, 200)).save(path)
+    cache = open_extraction_cache(tmp_path / "cache.sqlite3")
+    
+    clear_session_cache()
+    files_data = list(iter_extract_files([str(path)], workers=1, persistent_cache=cache, triage=True))
+    assert files_data[0]["hash_status"] == "deferred"
+    assert complete_deferred_hashes(files_data, persistent_cache=cache) == 1
+    
+    def no_hashing(file_path):
+        raise AssertionError("cached file was hashed again")
+    
+    monkeypatch.setattr(pipeline, "calculate_hashes_and_fingerprints", no_hashing)
+    assert list(iter_extract_files([str(path)], workers=1, persistent_cache=cache)) == files_data
+    clear_session_cache()
+    assert list(iter_extract_files([str(path)], workers=1, persistent_cache=cache)) == files_data
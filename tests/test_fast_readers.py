@@ -0,0 +1,207 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.image_fast import read_image_info
+from core.office_fast import read_office_info
+from core.pdf_fast import read_pdf_info
+
+
+def pillow_image_info(file_path):
+    from PIL import Image
+    from PIL.ExifTags import TAGS
+    
+    image = Image.open(file_path)
+    info = {"image_format": image.format, "image_size": image.size, "image_mode": image.mode}
+    exif_data = image._getexif() if hasattr(image, "_getexif") else None
+    if exif_data:
+        for tag_id, value in exif_data.items():
+            info[f"exif_{TAGS.get(tag_id, tag_id)}"] = str(value)[:100]
+    if image.format == "PNG":
+        for keyword, value in image.text.items():
+            info[f"png_{keyword}"] = value[:100]
+    if image.format == "GIF" and "comment" in image.info:
+        info["gif_comment"] = image.info["comment"].decode("latin-1")[:100]
+    return info
+
+
+def sample_exif():
+    from PIL import Image
+    
+    exif = Image.Exif()
+    exif[0x010F] = "Canon"
+    exif[0x0110] = "EOS 5D"
+    exif[0x0131] = "Editor 1.0"
+    exif[0x0132] = "2024:01:02 03:04:05"
+    exif[0x013B] = "Jane Doe"
+    exif_ifd = exif.get_ifd(0x8769)
+    exif_ifd[0x9003] = "2024:01:02 03:04:05"
+    exif_ifd[0x829A] = 0.004
+    # Larger than the blob read limit, with both quote characters, like real maker notes.
+    exif_ifd[0x927C] = b"MakerNote 'quoted' \"double\" \\ \t\n" + bytes(range(256)) * 20
+    gps_ifd = exif.get_ifd(0x8825)
+    gps_ifd[0x0001] = "N"
+    gps_ifd[0x0002] = (52.0, 31.0, 12.5)
+    gps_ifd[0x0003] = "E"
+    gps_ifd[0x0004] = (13.0, 24.0, 36.0)
+    return exif
+
+
+@pytest.mark.parametrize("mode", ["RGB", "L", "CMYK"])
+def test_jpeg_matches_pillow(tmp_path, mode):
+    from PIL import Image
+    
+    path = tmp_path / "photo.jpg"
+    Image.new(mode, (31, 17)).save(path, exif=sample_exif())
+    assert read_image_info(path) == pillow_image_info(path)
+
+
+def test_jpeg_without_exif_matches_pillow(tmp_path):
+    from PIL import Image
+    
+    path = tmp_path / "plain.jpg"
+    Image.new("RGB", (8, 8)).save(path)
+    assert read_image_info(path) == pillow_image_info(path)
+
+
+@pytest.mark.parametrize("mode", ["RGB", "RGBA", "L", "P", "1", "LA"])
+def test_png_matches_pillow(tmp_path, mode):
+    from PIL import Image, PngImagePlugin
+    
+    text = PngImagePlugin.PngInfo()
+    text.add_text("Author", "Jane Doe")
+    text.add_text("Comment", "x" * 500, zip=True)
+    text.add_itxt("Title", "Überschrift", lang="de")
+    path = tmp_path / "image.png"
+    Image.new(mode, (9, 5)).save(path, pnginfo=text, exif=sample_exif())
+    assert read_image_info(path) == pillow_image_info(path)
+
+
+def test_gif_matches_pillow(tmp_path):
+    from PIL import Image
+    
+    path = tmp_path / "anim.gif"
+    Image.new("P", (12, 7)).save(path, comment=b"made by test")
+    assert read_image_info(path) == pillow_image_info(path)
+
+
+@pytest.mark.parametrize("mode", ["RGB", "L", "P", "1"])
+def test_bmp_matches_pillow(tmp_path, mode):
+    from PIL import Image
+    
+    path = tmp_path / "image.bmp"
+    Image.new(mode, (10, 6)).save(path)
+    assert read_image_info(path) == pillow_image_info(path)
+
+
+def test_pdf_matches_pypdf2(tmp_path):
+    from PyPDF2 import PdfReader, PdfWriter
+    
+    writer = PdfWriter()
+    for _ in range(3):
+        writer.add_blank_page(width=200, height=200)
+    writer.add_metadata({"/Author": "Jane Doe", "/Title": "Quarterly (draft)", "/Producer": "test",
+                         "/CreationDate": "D:20240102030405Z"})
+    path = tmp_path / "doc.pdf"
+    with open(path, "wb") as f:
+        writer.write(f)
+    
+    reader = PdfReader(path)
+    info = read_pdf_info(path)
+    assert info["pages"] == len(reader.pages)
+    assert info["metadata"] == {key: str(value) for key, value in reader.metadata.items()}
+
+
+def write_hybrid_pdf(path, xref_stream=True):
+    # Classic table marks the compressed /Info (object 5) free; /XRefStm (object 10) locates it in object 4.
+    info = b"<< /Author (Alice) /Title (Hybrid) >>"
+    header = b"5 0 "
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        2: b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        3: b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 200 200] >>",
+        4: b"<< /Type /ObjStm /N 1 /First %d /Length %d >>\nstream\n%s\nendstream" % (len(header), len(header + info), header + info),
+        10: b"<< /Type /XRef /W [1 2 1] /Index [5 1] /Size 11 /Length 4 >>\nstream\n\x02\x00\x04\x00\nendstream",
+    }
+    out = bytearray(b"%PDF-1.5\n")
+    offsets = {}
+    for num, body in objects.items():
+        offsets[num] = len(out)
+        out += b"%d 0 obj\n%s\nendobj\n" % (num, body)
+    
+    xref = len(out)
+    out += b"xref\n0 11\n0000000000 65535 f \n"
+    for num in range(1, 11):
+        out += b"%010d 00000 n \n" % offsets[num] if num in offsets else b"0000000000 65535 f \n"
+    hybrid = b" /XRefStm %d" % offsets[10] if xref_stream else b""
+    out += b"trailer\n<< /Size 11 /Root 1 0 R /Info 5 0 R%s >>\nstartxref\n%d\n%%%%EOF\n" % (hybrid, xref)
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def test_hybrid_pdf_matches_pypdf2(tmp_path):
+    from PyPDF2 import PdfReader
+    
+    path = tmp_path / "hybrid.pdf"
+    write_hybrid_pdf(path)
+    info = read_pdf_info(path)
+    assert info["metadata"] == dict(PdfReader(path).metadata) == {"/Author": "Alice", "/Title": "Hybrid"}
+    assert info["pages"] == 1
+
+
+def test_pdf_with_unresolved_info_falls_back(tmp_path):
+    path = tmp_path / "dangling.pdf"
+    write_hybrid_pdf(path, xref_stream=False)
+    assert read_pdf_info(path) is None
+
+
+def test_docx_matches_python_docx(tmp_path):
+    from docx import Document
+    
+    document = Document()
+    document.add_paragraph("first")
+    document.add_paragraph("second")
+    document.core_properties.author = "Jane Doe"
+    document.core_properties.title = "Report"
+    path = tmp_path / "report.docx"
+    document.save(path)
+    
+    document = Document(path)
+    props = document.core_properties
+    info = read_office_info(path, ".docx")
+    assert info["word_paragraphs"] == len(document.paragraphs)
+    assert info["word_author"] == props.author
+    assert info["word_title"] == props.title
+    assert info["word_created"] == (str(props.created) if props.created else "")
+    assert info["word_modified"] == (str(props.modified) if props.modified else "")
+
+
+def test_xlsx_matches_openpyxl(tmp_path):
+    from openpyxl import Workbook, load_workbook
+    
+    workbook = Workbook()
+    workbook.active.title = "Summary"
+    workbook.create_sheet("Data")
+    path = tmp_path / "book.xlsx"
+    workbook.save(path)
+    
+    workbook = load_workbook(path, read_only=True)
+    info = read_office_info(path, ".xlsx")
+    assert info["excel_sheet_names"] == workbook.sheetnames
+    assert info["excel_sheets"] == len(workbook.sheetnames)
+    workbook.close()
+
+
+def test_pptx_matches_python_pptx(tmp_path):
+    from pptx import Presentation
+    
+    presentation = Presentation()
+    for _ in range(2):
+        presentation.slides.add_slide(presentation.slide_layouts[6])
+    path = tmp_path / "deck.pptx"
+    presentation.save(path)
+    
+    assert read_office_info(path, ".pptx")["pptx_slides"] == len(Presentation(path).slides)
@@ -0,0 +1,43 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.pdf_report import render_pdf_section, report_sections, write_pdf_report
+
+
+def sample_case(file_count):
+    files = [{
+        "file_path": f"/evidence/file_{index}.pdf",
+        "metadata": {"file_name": f"file_{index}.pdf", "file_size": 100, "pdf_author": "alice"},
+        "hashes": {"md5": "0" * 32},
+        "anomalies": [{"type": "timestamp", "severity": "high", "message": "created after modified"}]
+    } for index in range(file_count)]
+    correlations = [{"type": "metadata_match", "matched_field": "pdf_author", "matched_value": "alice",
+                     "file_count": file_count, "file_indices": list(range(file_count)), "files": [f["metadata"]["file_name"] for f in files],
+                     "confidence": 95, "explanation": "shared author"}]
+    return {"case_id": "1", "case_name": "merge", "created_at": "2026-01-01T00:00:00", "total_files": file_count,
+            "files": files, "correlations": correlations, "correlation_count": 1}
+
+
+def test_merged_report_is_valid_pdf(tmp_path):
+    from PyPDF2 import PdfReader
+    
+    case = sample_case(3)
+    total, sections = report_sections(case)
+    assert total >= 2
+    expected_pages = 0
+    for position, section in enumerate(sections):
+        part = render_pdf_section(section, tmp_path / f"part_{position}.pdf")
+        expected_pages += len(PdfReader(str(part)).pages)
+    first_info = PdfReader(str(tmp_path / "part_0.pdf")).metadata
+    
+    output_path = tmp_path / "report.pdf"
+    assert write_pdf_report(case, output_path) == total
+    
+    reader = PdfReader(str(output_path), strict=True)
+    assert len(reader.pages) == expected_pages
+    assert reader.metadata is not None
+    assert reader.metadata.get("/Producer") == first_info.get("/Producer")
+    for page in reader.pages:
+        page.extract_text()
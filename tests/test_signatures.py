@@ -0,0 +1,24 @@
+import sys
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.signatures import detect_zip_subtype
+
+
+def write_zip(path, names):
+    with zipfile.ZipFile(path, "w") as archive:
+        for name in names:
+            archive.writestr(name, "x")
+    return path
+
+
+def test_office_precedence_spans_all_members(tmp_path):
+    presentation = write_zip(tmp_path / "a.zip", ["[Content_Types].xml", "word/document.xml", "xl/workbook.xml", "ppt/presentation.xml"])
+    workbook = write_zip(tmp_path / "b.zip", ["[Content_Types].xml", "word/document.xml", "xl/workbook.xml"])
+    document = write_zip(tmp_path / "c.zip", ["[Content_Types].xml", "visio/document.xml", "word/document.xml"])
+    
+    assert ".pptx" in detect_zip_subtype(str(presentation))
+    assert ".xlsx" in detect_zip_subtype(str(workbook))
+    assert ".docx" in detect_zip_subtype(str(document))